@@ -1,26 +1,132 @@
 import sys
 import os
 import json
+import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import zip_longest
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QListWidget, QFileDialog, QSpinBox, 
     QGroupBox, QMessageBox, QGridLayout, QScrollArea,
     QSplitter, QSlider, QCheckBox, QComboBox, QListView, QTreeView,
     QDialog, QListWidgetItem, QProgressBar, QTabWidget, QTextEdit,
-    QAbstractItemView, QTreeWidget, QTreeWidgetItem, QLineEdit
+    QAbstractItemView, QTreeWidget, QTreeWidgetItem, QLineEdit, QAction, QMenu
 )
-from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QColor, QCursor
-from PyQt5.QtCore import Qt, QPoint, QRect
-from PIL import Image
+from PyQt5.QtGui import QPixmap, QPixmapCache, QImage, QImageReader, QPainter, QPen, QColor, QCursor, QKeySequence, QRegion
+from PyQt5.QtCore import (
+    Qt, QPoint, QRect, QLine, QTimer, QThread, QObject, pyqtSignal,
+    QAbstractListModel, QModelIndex, QRunnable, QThreadPool
+)
+import numpy as np
+
+
+# PIL在拼接或工作区首次显示图片时才需要，首次使用时再导入，避免拖慢程序启动
+_PIL_IMAGE = None
+
+
+def _pil_image():
+    """获取PIL.Image模块（首次调用时导入）"""
+    global _PIL_IMAGE
+    if _PIL_IMAGE is None:
+        from PIL import Image
+        _PIL_IMAGE = Image
+    return _PIL_IMAGE
+
+
+def _read_image_header(file_path):
+    """只读取图片文件头，返回(宽, 高, 像素格式)，不解码像素数据；无法识别或读不到尺寸时返回None"""
+    reader = QImageReader(file_path)
+    size = reader.size()
+    if not reader.canRead() or not size.isValid() or size.isEmpty():
+        return None
+    return size.width(), size.height(), reader.imageFormat()
+
+
+def _list_subdirectories(directory_path):
+    """列出目录下的子目录，按名称排序，返回[(目录名, 完整路径)]"""
+    # scandir遍历时已带回条目类型，通常无需再逐个stat
+    with os.scandir(directory_path) as entries:
+        subdirs = [(entry.name, entry.path) for entry in entries if entry.is_dir()]
+    subdirs.sort()
+    return subdirs
+
+
+class DirectoryScanSignals(QObject):
+    """目录扫描任务的信号（QRunnable不是QObject，信号放在单独的对象上）"""
+    
+    scan_finished = pyqtSignal(str, object)
+    scan_failed = pyqtSignal(str, object)
+
+
+class DirectoryScanTask(QRunnable):
+    """目录扫描任务，在线程池中列出子目录，避免网络路径等慢速目录卡住界面"""
+    
+    def __init__(self, directory_path):
+        super().__init__()
+        self.directory_path = directory_path  # 要扫描的目录
+        self.signals = DirectoryScanSignals()  # 结果通过信号送回界面线程
+    
+    def run(self):
+        """执行扫描"""
+        try:
+            subdirs = _list_subdirectories(self.directory_path)
+            self.signals.scan_finished.emit(self.directory_path, subdirs)
+        except Exception as e:
+            self.signals.scan_failed.emit(self.directory_path, e)
+
+
+class FileListModel(QAbstractListModel):
+    """文件预览列表模型，只保存文件名列表，视图滚动到底部时再分批提供更多行"""
+    
+    # 每次向视图提供的行数
+    FETCH_BATCH_SIZE = 500
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.file_names = []  # 全部文件名
+        self.fetched_count = 0  # 已提供给视图的行数
+    
+    def set_file_names(self, file_names):
+        """替换全部文件名，视图先只显示第一批"""
+        self.beginResetModel()
+        self.file_names = file_names
+        self.fetched_count = min(len(file_names), self.FETCH_BATCH_SIZE)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.fetched_count
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.file_names[index.row()]
+        return None
+    
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.fetched_count < len(self.file_names)
+    
+    def fetchMore(self, parent):
+        count = min(len(self.file_names) - self.fetched_count, self.FETCH_BATCH_SIZE)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched_count, self.fetched_count + count - 1)
+        self.fetched_count += count
+        self.endInsertRows()
 
 
 class AdvancedImageFileDialog(QDialog):
     """高级图片文件选择对话框，支持多目录选择"""
     
+    # 支持的图片扩展名（小写）
+    IMAGE_EXTENSIONS = frozenset(('.png', '.jpg', '.jpeg', '.bmp', '.gif'))
+    
     def __init__(self, parent=None, language_dict=None, current_language='zh_CN', initial_path=None):
         super().__init__(parent)
         self.selected_directories = []
+        self._selected_items = {}  # 已选目录列表中的列表项，键为目录路径
+        self._tree_items = {}  # 目录树中已加载的目录项，键为目录完整路径
+        self._scanning_paths = set()  # 正在后台加载子目录的目录路径
         self.language_dict = language_dict or self.load_default_language_dict()
         self.current_language = current_language
         self.initial_path = initial_path or "."
@@ -137,7 +243,12 @@ class AdvancedImageFileDialog(QDialog):
         
         self.address_bar = QLineEdit()
         self.address_bar.setPlaceholderText(self.language_dict[self.current_language]['enter_path_or_browse'])
-        self.address_bar.textEdited.connect(self.navigate_to_address)
+        # 输入地址时停顿一段时间后才导航，避免每次按键都重建目录树
+        self._address_timer = QTimer(self)
+        self._address_timer.setSingleShot(True)
+        self._address_timer.setInterval(250)
+        self._address_timer.timeout.connect(self.navigate_to_address)
+        self.address_bar.textEdited.connect(lambda text: self._address_timer.start())
         address_layout.addWidget(self.address_bar)
         
         self.browse_btn = QPushButton(self.language_dict[self.current_language]['browse'])
@@ -167,6 +278,9 @@ class AdvancedImageFileDialog(QDialog):
         self.directory_tree.setColumnWidth(0, 300)
         self.directory_tree.setColumnWidth(1, 80)
         self.directory_tree.itemChanged.connect(self.on_item_changed)
+        # 连接展开事件（只连接一次，重建目录树时不再重复连接）
+        self.directory_tree.itemExpanded.connect(self.on_item_expanded)
+        self.directory_tree.itemCollapsed.connect(self.on_item_collapsed)
         left_layout.addWidget(self.directory_tree)
         
         # 目录操作按钮
@@ -250,7 +364,11 @@ class AdvancedImageFileDialog(QDialog):
         bottom_layout = QVBoxLayout(bottom_widget)
         bottom_layout.addWidget(QLabel(self.language_dict[self.current_language]['images_in_directory']))
         
-        self.file_list = QListWidget()
+        # 文件名按需分批显示，目录中文件很多时不必一次创建全部列表项
+        self.file_list_model = FileListModel(self)
+        self.file_list = QListView()
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.setModel(self.file_list_model)
         bottom_layout.addWidget(self.file_list)
         
         # 文件统计信息
@@ -288,10 +406,7 @@ class AdvancedImageFileDialog(QDialog):
     def populate_directory_tree(self, initial_path=None):
         """填充目录树（懒加载模式）"""
         self.directory_tree.clear()
-        
-        # 连接展开事件
-        self.directory_tree.itemExpanded.connect(self.on_item_expanded)
-        self.directory_tree.itemCollapsed.connect(self.on_item_collapsed)
+        self._tree_items.clear()
         
         if initial_path:
             # 使用指定路径作为根节点
@@ -299,6 +414,7 @@ class AdvancedImageFileDialog(QDialog):
             root_item.setText(0, initial_path)
             root_item.setFlags(root_item.flags() | Qt.ItemIsUserCheckable)
             root_item.setCheckState(0, Qt.Unchecked)
+            self._tree_items[initial_path] = root_item
             
             # 添加子目录占位符（懒加载）
             child_item = QTreeWidgetItem(root_item)
@@ -309,7 +425,6 @@ class AdvancedImageFileDialog(QDialog):
             self.directory_tree.expandItem(root_item)
         else:
             # 获取驱动器列表（Windows）
-            import string
             drives = [f"{d}:\\" for d in string.ascii_uppercase if os.path.exists(f"{d}:\\")]
             
             for drive in drives:
@@ -317,6 +432,7 @@ class AdvancedImageFileDialog(QDialog):
                 drive_item.setText(0, drive)
                 drive_item.setFlags(drive_item.flags() | Qt.ItemIsUserCheckable)
                 drive_item.setCheckState(0, Qt.Unchecked)
+                self._tree_items[drive] = drive_item
                 
                 # 添加子目录占位符（懒加载）
                 child_item = QTreeWidgetItem(drive_item)
@@ -326,11 +442,7 @@ class AdvancedImageFileDialog(QDialog):
     def on_item_expanded(self, item):
         """目录项展开时的处理（懒加载子目录）"""
         # 如果当前项有子项且是占位符，则加载真实子目录
-        if item.childCount() == 1 and item.child(0).text(0) == self.language_dict[self.current_language]['click_to_expand']:
-            # 移除占位符
-            item.removeChild(item.child(0))
-            
-            # 加载子目录
+        if self._is_unloaded(item):
             self.load_subdirectories(item)
     
     def on_item_collapsed(self, item):
@@ -339,45 +451,71 @@ class AdvancedImageFileDialog(QDialog):
         # 这里选择保留，因为重新加载可能耗时
         pass
     
+    def _is_unloaded(self, item):
+        """目录项的子目录是否尚未加载（只有一个占位符子项）"""
+        return item.childCount() == 1 and item.child(0).text(0) == self.language_dict[self.current_language]['click_to_expand']
+    
     def load_subdirectories(self, parent_item):
-        """加载指定目录的子目录"""
+        """在线程池中加载指定目录的子目录，完成后再添加到目录树（占位符保留到加载完成）"""
         directory_path = self.get_item_full_path(parent_item)
+        if directory_path in self._scanning_paths:
+            # 该目录正在加载中
+            return
         
-        try:
-            # 获取子目录列表
-            subdirs = []
-            for entry in os.listdir(directory_path):
-                entry_path = os.path.join(directory_path, entry)
-                if os.path.isdir(entry_path):
-                    subdirs.append(entry)
-            
-            # 按名称排序
-            subdirs.sort()
+        self._scanning_paths.add(directory_path)
+        task = DirectoryScanTask(directory_path)
+        task.signals.scan_finished.connect(self.on_subdirectories_scanned)
+        task.signals.scan_failed.connect(self.on_subdirectories_scan_failed)
+        QThreadPool.globalInstance().start(task)
+    
+    def _take_unloaded_item(self, directory_path):
+        """加载完成时取出对应的目录项并移除占位符；目录树已重建或已加载过时返回None"""
+        self._scanning_paths.discard(directory_path)
+        parent_item = self._tree_items.get(directory_path)
+        if parent_item is None or not self._is_unloaded(parent_item):
+            return None
+        
+        # 移除占位符
+        parent_item.removeChild(parent_item.child(0))
+        return parent_item
+    
+    def on_subdirectories_scanned(self, directory_path, subdirs):
+        """子目录加载完成，添加子目录项"""
+        parent_item = self._take_unloaded_item(directory_path)
+        if parent_item is None:
+            return
+        
+        # 先创建所有子目录项，再一次性加入目录树（未加入树的项修改时不会触发itemChanged）
+        subdir_items = []
+        for subdir_name, subdir_path in subdirs:
+            subdir_item = QTreeWidgetItem()
+            subdir_item.setText(0, subdir_name)  # 只显示目录名
+            subdir_item.setData(0, Qt.UserRole, subdir_path)  # 存储完整路径
+            subdir_item.setFlags(subdir_item.flags() | Qt.ItemIsUserCheckable)
+            subdir_item.setCheckState(0, Qt.Unchecked)
+            self._tree_items[subdir_path] = subdir_item
             
-            # 添加子目录项
-            for subdir in subdirs:
-                subdir_path = os.path.join(directory_path, subdir)
-                subdir_item = QTreeWidgetItem(parent_item)
-                subdir_item.setText(0, subdir)  # 只显示目录名
-                subdir_item.setData(0, Qt.UserRole, subdir_path)  # 存储完整路径
-                subdir_item.setFlags(subdir_item.flags() | Qt.ItemIsUserCheckable)
-                subdir_item.setCheckState(0, Qt.Unchecked)
-                
-                # 添加子目录占位符（懒加载）
-                child_item = QTreeWidgetItem(subdir_item)
-                child_item.setText(0, self.language_dict[self.current_language]['click_to_expand'])
-                child_item.setFlags(child_item.flags() & ~Qt.ItemIsUserCheckable)
-                
-        except PermissionError:
+            # 添加子目录占位符（懒加载）
+            child_item = QTreeWidgetItem(subdir_item)
+            child_item.setText(0, self.language_dict[self.current_language]['click_to_expand'])
+            child_item.setFlags(child_item.flags() & ~Qt.ItemIsUserCheckable)
+            subdir_items.append(subdir_item)
+        parent_item.addChildren(subdir_items)
+    
+    def on_subdirectories_scan_failed(self, directory_path, error):
+        """子目录加载失败，显示错误项"""
+        parent_item = self._take_unloaded_item(directory_path)
+        if parent_item is None:
+            return
+        
+        error_item = QTreeWidgetItem(parent_item)
+        if isinstance(error, PermissionError):
             # 无权限访问的目录
-            error_item = QTreeWidgetItem(parent_item)
             error_item.setText(0, self.language_dict[self.current_language]['no_access_permission'])
-            error_item.setFlags(error_item.flags() & ~Qt.ItemIsUserCheckable)
-        except Exception as e:
+        else:
             # 其他错误
-            error_item = QTreeWidgetItem(parent_item)
-            error_item.setText(0, self.language_dict[self.current_language]['load_failed'].format(str(e)))
-            error_item.setFlags(error_item.flags() & ~Qt.ItemIsUserCheckable)
+            error_item.setText(0, self.language_dict[self.current_language]['load_failed'].format(str(error)))
+        error_item.setFlags(error_item.flags() & ~Qt.ItemIsUserCheckable)
     
     def get_item_full_path(self, item):
         """获取目录项的完整路径"""
@@ -396,19 +534,19 @@ class AdvancedImageFileDialog(QDialog):
             
             if item.checkState(0) == Qt.Checked:
                 # 添加目录到已选列表
-                if directory_path not in self.selected_directories:
+                if directory_path not in self._selected_items:
                     self.selected_directories.append(directory_path)
-                    self.selected_list.addItem(directory_path)
+                    list_item = QListWidgetItem(directory_path)
+                    self.selected_list.addItem(list_item)
+                    self._selected_items[directory_path] = list_item
                     self.update_file_list()
             else:
                 # 从已选列表中移除目录
-                if directory_path in self.selected_directories:
+                list_item = self._selected_items.pop(directory_path, None)
+                if list_item is not None:
                     self.selected_directories.remove(directory_path)
                     # 从列表控件中移除
-                    for i in range(self.selected_list.count()):
-                        if self.selected_list.item(i).text() == directory_path:
-                            self.selected_list.takeItem(i)
-                            break
+                    self.selected_list.takeItem(self.selected_list.row(list_item))
                     self.update_file_list()
     
     def refresh_directory_tree(self):
@@ -420,7 +558,7 @@ class AdvancedImageFileDialog(QDialog):
         current_item = self.selected_list.currentItem()
         if current_item:
             directory_path = current_item.text()
-            if directory_path in self.selected_directories:
+            if self._selected_items.pop(directory_path, None) is not None:
                 self.selected_directories.remove(directory_path)
                 self.selected_list.takeItem(self.selected_list.row(current_item))
                 
@@ -431,6 +569,7 @@ class AdvancedImageFileDialog(QDialog):
     def clear_selected(self):
         """清空已选目录"""
         self.selected_directories.clear()
+        self._selected_items.clear()
         self.selected_list.clear()
         
         # 更新目录树的勾选状态
@@ -439,21 +578,10 @@ class AdvancedImageFileDialog(QDialog):
     
     def update_tree_check_state(self, directory_path, checked):
         """更新目录树中指定目录的勾选状态"""
-        # 遍历所有目录项
-        def update_item(item):
-            if self.get_item_full_path(item) == directory_path:
-                item.setCheckState(0, Qt.Checked if checked else Qt.Unchecked)
-                return True
-            
-            # 递归检查子项
-            for i in range(item.childCount()):
-                if update_item(item.child(i)):
-                    return True
-            return False
-        
-        for i in range(self.directory_tree.topLevelItemCount()):
-            if update_item(self.directory_tree.topLevelItem(i)):
-                break
+        # 按路径直接找到已加载的目录项，无需遍历整个目录树
+        item = self._tree_items.get(directory_path)
+        if item is not None:
+            item.setCheckState(0, Qt.Checked if checked else Qt.Unchecked)
     
     def update_all_tree_check_states(self, checked):
         """更新目录树中所有目录的勾选状态"""
@@ -468,9 +596,8 @@ class AdvancedImageFileDialog(QDialog):
     
     def update_file_list(self):
         """更新文件列表"""
-        self.file_list.clear()
-        
         if not self.selected_directories:
+            self.file_list_model.set_file_names([])
             try:
                 self.file_info_label.setText(self.language_dict[self.current_language]['file_info_selected'].format(0, 0))
             except Exception as e:
@@ -483,31 +610,43 @@ class AdvancedImageFileDialog(QDialog):
         for directory in self.selected_directories:
             if self.include_subdirs_check.isChecked():
                 # 包含子目录
-                for root, dirs, files in os.walk(directory):
-                    for file in files:
-                        if self.is_image_file(file):
-                            all_files.append(os.path.join(root, file))
+                all_files.extend(self._walk_image_files(directory))
             else:
                 # 仅当前目录
                 try:
-                    files = os.listdir(directory)
-                    for file in files:
-                        file_path = os.path.join(directory, file)
-                        if os.path.isfile(file_path) and self.is_image_file(file):
-                            all_files.append(file_path)
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_file() and self.is_image_file(entry.name):
+                                all_files.append(entry.path)
                 except PermissionError:
                     continue
         
-        # 添加到文件列表
-        for file_path in all_files:
-            self.file_list.addItem(os.path.basename(file_path))
+        # 更新文件列表
+        self.file_list_model.set_file_names([os.path.basename(file_path) for file_path in all_files])
         
         self.file_info_label.setText(self.language_dict[self.current_language]['file_info_selected'].format(len(self.selected_directories), len(all_files)))
     
+    def _walk_image_files(self, directory):
+        """递归收集目录中的图片文件路径，顺序与os.walk一致（先当前目录的文件，再依次进入子目录）"""
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            # 与os.walk一样跳过无法访问的目录
+            return []
+        
+        image_files = [entry.path for entry in entries if not entry.is_dir() and self.is_image_file(entry.name)]
+        for entry in entries:
+            # 不进入指向目录的符号链接，避免循环
+            if entry.is_dir() and not entry.is_symlink():
+                image_files.extend(self._walk_image_files(entry.path))
+        return image_files
+    
     def is_image_file(self, filename):
         """检查文件是否为图片文件"""
-        image_extensions = ['.png', '.jpg', '.jpeg', '.bmp', '.gif']
-        return any(filename.lower().endswith(ext) for ext in image_extensions)
+        # 只取最后一个点之后的扩展名小写后查表
+        dot_index = filename.rfind('.')
+        return dot_index >= 0 and filename[dot_index:].lower() in self.IMAGE_EXTENSIONS
     
     def navigate_to_address(self):
         """导航到地址栏指定的路径"""
@@ -564,9 +703,163 @@ class AdvancedImageFileDialog(QDialog):
 
 
 
+class StitchWorker(QObject):
+    """拼接工作类，在后台线程中合成精灵图表，避免阻塞界面"""
+    
+    progress_updated = pyqtSignal(int)
+    stitch_finished = pyqtSignal(object)
+    stitch_failed = pyqtSignal(str)
+    
+    def __init__(self, compose, params):
+        super().__init__()
+        self.compose = compose  # 合成函数，不访问界面控件
+        self.params = params  # 拼接参数和图片数据快照
+    
+    def run(self):
+        """执行拼接"""
+        try:
+            canvas = self.compose(self.params, self.progress_updated.emit)
+            self.stitch_finished.emit(canvas)
+        except Exception as e:
+            self.stitch_failed.emit(str(e))
+
+
+class SaveWorker(QObject):
+    """保存工作类，在后台线程中编码并保存拼接结果，避免PNG编码阻塞界面"""
+    
+    save_finished = pyqtSignal(str)
+    save_failed = pyqtSignal(str)
+    
+    def __init__(self, canvas, file_path):
+        super().__init__()
+        self.canvas = canvas  # 拼接结果的RGBA画布
+        self.file_path = file_path  # 保存路径
+    
+    def run(self):
+        """执行保存"""
+        try:
+            _pil_image().fromarray(self.canvas).save(self.file_path, 'PNG')
+            self.save_finished.emit(self.file_path)
+        except Exception as e:
+            self.save_failed.emit(str(e))
+
+
+class WorkspaceWidget(QLabel):
+    """工作区预览控件，分层绘制背景、当前图片和参考图，只重绘发生变化的区域"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.bg = None  # 背景图层（底色、网格和中心点）
+        self.layers = []  # 前景图层列表，元素为(x, y, QPixmap, 透明度, 是否直接覆盖)
+    
+    def set_layers(self, bg, layers):
+        """设置要显示的图层；背景未变时只重绘发生变化的前景图层新旧位置覆盖的区域"""
+        if bg is self.bg and not self.text():
+            dirty = QRegion()
+            for old, new in zip_longest(self.layers, layers):
+                if old is not None and new is not None and self._layer_key(old) == self._layer_key(new):
+                    # 图层未变化（如拖动当前图片时的参考图），无需重绘
+                    continue
+                for layer in (old, new):
+                    if layer is not None:
+                        x, y, pixmap = layer[:3]
+                        dirty += QRect(x, y, pixmap.width(), pixmap.height())
+            dirty &= QRect(0, 0, bg.width(), bg.height())
+            self.layers = layers
+            if not dirty.isEmpty():
+                self.update(dirty.translated(self._origin()))
+            return
+        
+        # 背景变化或之前显示的是提示文字，整体重绘
+        if self.text():
+            super().clear()
+        self.bg = bg
+        self.layers = layers
+        self.update()
+    
+    def setText(self, text):
+        """显示提示文字，同时清除图层"""
+        self.bg = None
+        self.layers = []
+        super().setText(text)
+    
+    def clear(self):
+        """清除显示内容"""
+        self.bg = None
+        self.layers = []
+        super().clear()
+    
+    def _layer_key(self, layer):
+        """用于比较图层是否变化的键（QPixmap按cacheKey比较）"""
+        x, y, pixmap, opacity, copy = layer
+        return (x, y, pixmap.cacheKey(), opacity, copy)
+    
+    def _origin(self):
+        """背景图层左上角在控件中的位置（与QLabel居中显示图片的位置一致）"""
+        rect = self.contentsRect()
+        return QPoint(rect.x() + (rect.width() - self.bg.width()) // 2,
+                      rect.y() + (rect.height() - self.bg.height()) // 2)
+    
+    def paintEvent(self, event):
+        """只在需要重绘的区域内绘制各图层"""
+        if self.bg is None:
+            super().paintEvent(event)
+            return
+        
+        painter = QPainter(self)
+        self.drawFrame(painter)
+        origin = self._origin()
+        painter.setClipRegion(event.region() & self.contentsRect() & QRect(origin, self.bg.size()))
+        painter.translate(origin)
+        painter.drawPixmap(0, 0, self.bg)
+        for x, y, pixmap, opacity, copy in self.layers:
+            # 不透明图片直接覆盖背景，跳过逐像素混合
+            painter.setCompositionMode(QPainter.CompositionMode_Source if copy else QPainter.CompositionMode_SourceOver)
+            painter.setOpacity(opacity)
+            painter.drawPixmap(x, y, pixmap)
+        painter.end()
+
+
+class StitchPreviewWidget(QWidget):
+    """拼接结果预览控件，绘制时按控件大小等比缩放原图，窗口大小变化时自动适应"""
+    
+    def __init__(self, pixmap, parent=None):
+        super().__init__(parent)
+        self.pixmap = pixmap  # 拼接结果原图
+    
+    def paintEvent(self, event):
+        """由QPainter在绘制时缩放，不生成缩放后的图片副本"""
+        target = QRect(QPoint(0, 0), self.pixmap.size().scaled(self.size(), Qt.KeepAspectRatio))
+        target.moveCenter(self.rect().center())
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawPixmap(target, self.pixmap)
+        painter.end()
+
+
 class SpriteAlignerGUI(QMainWindow):
     """精灵图对齐工具的图形界面"""
     
+    # 自动对齐下拉框各选项对应的语言键（顺序与下拉框一致）
+    ALIGN_TYPES = ('none', 'left_align', 'right_align', 'top_align', 'bottom_align', 'center_align')
+    # 各对齐方式在X、Y方向上的偏移方向：图片中心点相对工作区中心点偏移 方向 * 尺寸 // 2，None 表示该方向不修改
+    ALIGN_DIRECTIONS = {
+        'center_align': (0, 0),  # 图片中心点精确对齐到工作区中心点
+        'left_align': (-1, None),  # 对齐到工作区中心点左侧，距离为图片宽度的一半
+        'right_align': (1, None),  # 对齐到工作区中心点右侧，距离为图片宽度的一半
+        'top_align': (None, -1),  # 对齐到工作区中心点上方，距离为图片高度的一半
+        'bottom_align': (None, 1),  # 对齐到工作区中心点下方，距离为图片高度的一半
+    }
+    # 连续缩放时使用的多级缩放图倍数（1为原图）；只用于缩小，放大时直接从原图快速缩放，
+    # 避免生成比原图大数倍、可能超出QPixmapCache上限的放大图
+    PYRAMID_SCALES = (0.25, 0.5, 1)
+    # 不含透明通道的图片格式（可从文件头直接判断）
+    OPAQUE_FORMATS = (QImage.Format_RGB32, QImage.Format_RGB888, QImage.Format_Grayscale8)
+    # 拼接时alpha混合每块处理的像素数（分块运算让中间缓冲区留在CPU缓存中）
+    BLEND_BLOCK_PIXELS = 64 * 1024
+    # 已解析的语言文件，键为文件路径，所有窗口共用，同一文件只读取和解析一次
+    _language_file_cache = {}
+    
     def __init__(self):
         super().__init__()
         # 初始化语言字典
@@ -586,6 +879,19 @@ class SpriteAlignerGUI(QMainWindow):
         self.min_zoom = 0.1  # 最小缩放比例
         self.max_zoom = 5.0  # 最大缩放比例
         self.current_image_visible = True  # 当前图片是否可见
+        self._pixmap_cache = {}  # 已加载的QPixmap缓存，键为文件路径
+        self._sprite_array_cache = {}  # 拼接用的图片数据缓存，键为文件路径，值为(修改时间, RGBA数组, alpha类型, 是否以自身为蒙版)
+        # 缩放图和多级缩放图存放在QPixmapCache中，超出上限时自动淘汰最久未用的项（单位KB）
+        QPixmapCache.setCacheLimit(64 * 1024)
+        self._grid_lines_cache = (None, [])  # 网格线缓存：((网格间距, 工作区大小), 线段列表)
+        self.workspace_size = 600  # 工作区画布大小
+        self._bg_pixmap = None  # 工作区背景（底色、网格和中心点）
+        self._bg_key = None  # 工作区背景对应的绘制参数，参数不变时不重建背景
+        self._interactive = False  # 是否处于连续缩放交互中（此时使用快速缩放）
+        self._update_pending = False  # 是否已有待执行的工作区重绘
+        self.preview_window = None  # 拼接结果预览窗口（保持引用，避免被回收）
+        self.stitch_thread = None  # 后台拼接或保存线程
+        self.stitch_worker = None  # 后台拼接或保存工作对象
         # 路径记忆功能
         self.last_selected_path = "."  # 默认当前目录
         self.config_file = os.path.join("config", "sprite_aligner_config.json")
@@ -597,8 +903,13 @@ class SpriteAlignerGUI(QMainWindow):
         """从JSON文件加载语言字典"""
         language_file = os.path.join("translations", "languages_Sprite2SpriteSheet.json")
         try:
-            with open(language_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            cached = self._language_file_cache.get(language_file)
+            if cached is None:
+                with open(language_file, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                self._language_file_cache[language_file] = cached
+            # 每个窗口使用自己的副本，补充缺失文本时不影响缓存
+            return {lang: dict(texts) for lang, texts in cached.items()}
         except Exception as e:
             print(f"无法加载语言文件: {e}")
             # 如果加载失败，返回默认的语言字典
@@ -664,7 +975,12 @@ class SpriteAlignerGUI(QMainWindow):
                     'single_image_width': '单个图片宽度:',
                     'single_image_height': '单个图片高度:',
                     'export_offset': '导出偏移设置',
-                    'import_offset': '导入偏移设置'
+                    'import_offset': '导入偏移设置',
+                    'select_import_method': '请选择导入方式：',
+                    'import_by_files': '导入多文件(单组)',
+                    'import_by_folders': '导入多目录(多组)',
+                    'stitch_by_group': '按组拼接(每组占据一行)',
+                    'tight_pack': '紧凑排列(忽略行列数和偏移量)'
                 },
                 'en_US': {
                     'window_title': 'Sprite Aligner',
@@ -740,7 +1056,12 @@ class SpriteAlignerGUI(QMainWindow):
                     'cannot_navigate_directory': 'Cannot navigate to directory: {0}',
                     'batch_align_success': 'Applied \'{0}\' to all {1} images',
                     'file_info_selected': 'Selected {0} directories, total {1} files',
-                    'stitch_preview': 'Stitch Result Preview'
+                    'stitch_preview': 'Stitch Result Preview',
+                    'select_import_method': 'Please select import method:',
+                    'import_by_files': 'Import Multi-File (Single Group)',
+                    'import_by_folders': 'Import Multi-Directory (Multi-Group)',
+                    'stitch_by_group': 'Stitch by Group (Each group occupies a row)',
+                    'tight_pack': 'Tight Pack (ignores rows, columns and offsets)'
                 }
             }
     
@@ -793,163 +1114,119 @@ class SpriteAlignerGUI(QMainWindow):
         
         self.current_language = language
         
-        # 重新翻译界面
-        self.retranslate_ui()
+        # 重新翻译界面：暂停窗口重绘，所有文本更新完后统一重绘一次
+        self.setUpdatesEnabled(False)
+        try:
+            self.retranslate_ui()
+        finally:
+            self.setUpdatesEnabled(True)
     
     def retranslate_ui(self):
         """重新翻译界面"""
         lang = self.current_language
+        # 当前语言的文本字典只查找一次
+        texts = self.language_dict[lang]
         
         # 更新窗口标题
-        self.setWindowTitle(self.language_dict[lang]['window_title'])
+        self.setWindowTitle(texts['window_title'])
         
         # 更新语言标签
-        self.language_label.setText(self.language_dict[lang]['language'])
+        self.language_label.setText(texts['language'])
         
         # 更新分组框标题
-        self.control_group.setTitle(self.language_dict[lang]['control_options'])
-        self.list_group.setTitle(self.language_dict[lang]['image_list'])
-        self.align_group.setTitle(self.language_dict[lang]['alignment_control'])
-        self.preview_group.setTitle(self.language_dict[lang]['workspace'])
-        self.stitch_group.setTitle(self.language_dict[lang]['stitch_settings'])
+        self.control_group.setTitle(texts['control_options'])
+        self.list_group.setTitle(texts['image_list'])
+        self.align_group.setTitle(texts['alignment_control'])
+        self.preview_group.setTitle(texts['workspace'])
+        self.stitch_group.setTitle(texts['stitch_settings'])
         
         # 更新按钮文本
-        self.import_btn.setText(self.language_dict[lang]['import_images'])
-        self.zoom_out_btn.setText(self.language_dict[lang]['zoom_out'])
-        self.zoom_in_btn.setText(self.language_dict[lang]['zoom_in'])
-        self.reset_zoom_btn.setText(self.language_dict[lang]['reset_zoom'])
-        self.move_up_btn.setText(self.language_dict[lang]['move_up'])
-        self.move_down_btn.setText(self.language_dict[lang]['move_down'])
-        self.set_ref_btn.setText(self.language_dict[lang]['set_as_reference'])
-        self.delete_btn.setText(self.language_dict[lang]['delete_image'])
-        self.reset_btn.setText(self.language_dict[lang]['reset_offset'])
-        self.auto_align_btn.setText(self.language_dict[lang]['apply_to_current'])
-        self.batch_align_btn.setText(self.language_dict[lang]['batch_apply'])
-        self.stitch_save_btn.setText(self.language_dict[lang]['stitch_save'])
-        self.export_offset_btn.setText(self.language_dict[lang]['export_offset'])
-        self.import_offset_btn.setText(self.language_dict[lang]['import_offset'])
+        self.import_btn.setText(texts['import_images'])
+        self.zoom_out_btn.setText(texts['zoom_out'])
+        self.zoom_in_btn.setText(texts['zoom_in'])
+        self.reset_zoom_btn.setText(texts['reset_zoom'])
+        self.move_up_btn.setText(texts['move_up'])
+        self.move_down_btn.setText(texts['move_down'])
+        self.set_ref_btn.setText(texts['set_as_reference'])
+        self.delete_btn.setText(texts['delete_image'])
+        self.reset_btn.setText(texts['reset_offset'])
+        self.auto_align_btn.setText(texts['apply_to_current'])
+        self.batch_align_btn.setText(texts['batch_apply'])
+        self.stitch_save_btn.setText(texts['stitch_save'])
+        self.export_offset_btn.setText(texts['export_offset'])
+        self.import_offset_btn.setText(texts['import_offset'])
         
         # 更新标签文本
-        self.grid_size_label.setText(self.language_dict[lang]['grid_size'])
-        self.grid_check.setText(self.language_dict[lang]['show_grid'])
-        self.center_check.setText(self.language_dict[lang]['show_center'])
-        self.current_image_check.setText(self.language_dict[lang]['show_current_image'])
-        self.ref_label.setText(self.language_dict[lang]['reference_image'])
-        self.ref_check.setText(self.language_dict[lang]['show_reference'])
-        self.ref_opacity_label.setText(self.language_dict[lang]['reference_opacity'])
-        self.zoom_label_text.setText(self.language_dict[lang]['workspace_zoom'])
-        self.x_offset_label.setText(self.language_dict[lang]['x_offset'])
-        self.y_offset_label.setText(self.language_dict[lang]['y_offset'])
-        self.auto_label.setText(self.language_dict[lang]['auto_alignment'])
-        self.columns_label.setText(self.language_dict[lang]['columns'])
-        self.rows_label.setText(self.language_dict[lang]['rows'])
-        self.h_spacing_label.setText(self.language_dict[lang]['horizontal_spacing'])
-        self.v_spacing_label.setText(self.language_dict[lang]['vertical_spacing'])
+        self.grid_size_label.setText(texts['grid_size'])
+        self.grid_check.setText(texts['show_grid'])
+        self.center_check.setText(texts['show_center'])
+        self.current_image_check.setText(texts['show_current_image'])
+        self.ref_label.setText(texts['reference_image'])
+        self.ref_check.setText(texts['show_reference'])
+        self.ref_opacity_label.setText(texts['reference_opacity'])
+        self.zoom_label_text.setText(texts['workspace_zoom'])
+        self.x_offset_label.setText(texts['x_offset'])
+        self.y_offset_label.setText(texts['y_offset'])
+        self.auto_label.setText(texts['auto_alignment'])
+        self.columns_label.setText(texts['columns'])
+        self.rows_label.setText(texts['rows'])
+        self.h_spacing_label.setText(texts['horizontal_spacing'])
+        self.v_spacing_label.setText(texts['vertical_spacing'])
         
         # 检查语言字典中是否包含单个图片大小相关的键，如果没有，添加默认值
-        if 'single_image_width' not in self.language_dict[lang]:
-            self.language_dict[lang]['single_image_width'] = '单个图片宽度:' if lang == 'zh_CN' else 'Single Image Width:'
-        if 'single_image_height' not in self.language_dict[lang]:
-            self.language_dict[lang]['single_image_height'] = '单个图片高度:' if lang == 'zh_CN' else 'Single Image Height:'
+        if 'single_image_width' not in texts:
+            texts['single_image_width'] = '单个图片宽度:' if lang == 'zh_CN' else 'Single Image Width:'
+        if 'single_image_height' not in texts:
+            texts['single_image_height'] = '单个图片高度:' if lang == 'zh_CN' else 'Single Image Height:'
         
-        self.single_image_width_label.setText(self.language_dict[lang]['single_image_width'])
-        self.single_image_height_label.setText(self.language_dict[lang]['single_image_height'])
+        self.single_image_width_label.setText(texts['single_image_width'])
+        self.single_image_height_label.setText(texts['single_image_height'])
         
         # 更新复选框文本
-        self.stitch_by_group_check.setText(self.language_dict[self.current_language]['stitch_by_group'])
-        
-        # 更新自动对齐下拉框选项
-        self.auto_align_combo.clear()
-        self.auto_align_combo.addItems([
-            self.language_dict[lang]['none'],
-            self.language_dict[lang]['left_align'],
-            self.language_dict[lang]['right_align'],
-            self.language_dict[lang]['top_align'],
-            self.language_dict[lang]['bottom_align'],
-            self.language_dict[lang]['center_align']
-        ])
+        self.stitch_by_group_check.setText(texts['stitch_by_group'])
+        self.tight_pack_check.setText(texts['tight_pack'])
+        
+        # 更新自动对齐下拉框选项：原地替换文本，不重建选项，保留当前选中的对齐方式
+        for index, key in enumerate(self.ALIGN_TYPES):
+            self.auto_align_combo.setItemText(index, texts[key])
         
         # 更新工作区无图片提示
         if not self.images_data:
-            self.workspace_label.setText(self.language_dict[lang]['no_image_selected'])
+            self.workspace_label.setText(texts['no_image_selected'])
     
     def init_ui(self):
         """初始化界面"""
-        self.setWindowTitle(self.language_dict[self.current_language]['window_title'])
+        # 当前语言的文本字典只查找一次
+        texts = self.language_dict[self.current_language]
+        self.setWindowTitle(texts['window_title'])
         self.setGeometry(100, 100, 1200, 800)
         
-        # 设置快捷键
-        from PyQt5.QtWidgets import QShortcut
-        from PyQt5.QtGui import QKeySequence
-        
-        # 应用到当前图片：F5
-        self.shortcut_apply = QShortcut(QKeySequence("F5"), self)
-        self.shortcut_apply.activated.connect(self.apply_auto_align)
-        
-        # 批量应用到所有图片：Ctrl + F5
-        self.shortcut_batch_apply = QShortcut(QKeySequence("Ctrl+F5"), self)
-        self.shortcut_batch_apply.activated.connect(self.batch_apply_auto_align)
-        
-        # 删除图片：Delete
-        self.shortcut_delete = QShortcut(QKeySequence("Delete"), self)
-        self.shortcut_delete.activated.connect(self.delete_selected_image)
-        
-        # 显示网格：Ctrl+'（单引号）
-        self.shortcut_toggle_grid = QShortcut(QKeySequence("Ctrl+'"), self)
-        self.shortcut_toggle_grid.activated.connect(self.toggle_grid_by_shortcut)
-        
-        # 拼接并保存精灵图：Ctrl + S
-        self.shortcut_stitch_save = QShortcut(QKeySequence("Ctrl+S"), self)
-        self.shortcut_stitch_save.activated.connect(self.stitch_and_save_sprites)
-        
-        # 上移：Q
-        self.shortcut_move_up = QShortcut(QKeySequence("Q"), self)
-        self.shortcut_move_up.activated.connect(self.move_selected_up)
-        
-        # 下移：E
-        self.shortcut_move_down = QShortcut(QKeySequence("E"), self)
-        self.shortcut_move_down.activated.connect(self.move_selected_down)
-        
-        # 设为参考图：F
-        self.shortcut_set_reference = QShortcut(QKeySequence("F"), self)
-        self.shortcut_set_reference.activated.connect(self.set_selected_as_reference)
-        
-        # 选择上一张图片：A 或 W
-        self.shortcut_prev_image = QShortcut(QKeySequence("A"), self)
-        self.shortcut_prev_image.activated.connect(self.select_previous_image)
-        self.shortcut_prev_image_w = QShortcut(QKeySequence("W"), self)
-        self.shortcut_prev_image_w.activated.connect(self.select_previous_image)
-        
-        # 选择下一张图片：D 或 S
-        self.shortcut_next_image = QShortcut(QKeySequence("D"), self)
-        self.shortcut_next_image.activated.connect(self.select_next_image)
-        self.shortcut_next_image_s = QShortcut(QKeySequence("S"), self)
-        self.shortcut_next_image_s.activated.connect(self.select_next_image)
-        
-        # 切换参考图可视：C
-        self.shortcut_toggle_ref = QShortcut(QKeySequence("C"), self)
-        self.shortcut_toggle_ref.activated.connect(self.toggle_reference_by_shortcut)
-        
-        # Alt + W/A/S/D 调整XY偏移量
-        # Alt + W: Y偏移量减少
-        self.shortcut_alt_w = QShortcut(QKeySequence("Alt+W"), self)
-        self.shortcut_alt_w.activated.connect(lambda: self.adjust_offset(0, -1))
-        
-        # Alt + S: Y偏移量增加
-        self.shortcut_alt_s = QShortcut(QKeySequence("Alt+S"), self)
-        self.shortcut_alt_s.activated.connect(lambda: self.adjust_offset(0, 1))
-        
-        # Alt + A: X偏移量减少
-        self.shortcut_alt_a = QShortcut(QKeySequence("Alt+A"), self)
-        self.shortcut_alt_a.activated.connect(lambda: self.adjust_offset(-1, 0))
-        
-        # Alt + D: X偏移量增加
-        self.shortcut_alt_d = QShortcut(QKeySequence("Alt+D"), self)
-        self.shortcut_alt_d.activated.connect(lambda: self.adjust_offset(1, 0))
-        
-        # 切换当前图片显示：H
-        self.shortcut_toggle_current_image = QShortcut(QKeySequence("H"), self)
-        self.shortcut_toggle_current_image.activated.connect(self.toggle_current_image_by_shortcut)
+        # 设置快捷键：(按键, 槽函数)
+        shortcuts = [
+            ("F5", self.apply_auto_align),  # 应用到当前图片
+            ("Ctrl+F5", self.batch_apply_auto_align),  # 批量应用到所有图片
+            ("Delete", self.delete_selected_image),  # 删除图片
+            ("Ctrl+'", self.toggle_grid_by_shortcut),  # 显示网格
+            ("Ctrl+S", self.stitch_and_save_sprites),  # 拼接并保存精灵图
+            ("Q", self.move_selected_up),  # 上移
+            ("E", self.move_selected_down),  # 下移
+            ("F", self.set_selected_as_reference),  # 设为参考图
+            ("A", self.select_previous_image),  # 选择上一张图片
+            ("W", self.select_previous_image),
+            ("D", self.select_next_image),  # 选择下一张图片
+            ("S", self.select_next_image),
+            ("C", self.toggle_reference_by_shortcut),  # 切换参考图可视
+            ("Alt+W", partial(self.adjust_offset, 0, -1)),  # Y偏移量减少
+            ("Alt+S", partial(self.adjust_offset, 0, 1)),  # Y偏移量增加
+            ("Alt+A", partial(self.adjust_offset, -1, 0)),  # X偏移量减少
+            ("Alt+D", partial(self.adjust_offset, 1, 0)),  # X偏移量增加
+            ("H", self.toggle_current_image_by_shortcut),  # 切换当前图片显示
+        ]
+        for key, slot in shortcuts:
+            action = QAction(self)
+            action.setShortcut(QKeySequence(key))
+            action.triggered.connect(slot)
+            self.addAction(action)
         
         # 主窗口部件
         central_widget = QWidget()
@@ -961,7 +1238,7 @@ class SpriteAlignerGUI(QMainWindow):
         # 语言选择布局
         language_layout = QHBoxLayout()
         language_layout.addStretch()
-        self.language_label = QLabel(self.language_dict[self.current_language]['language'])
+        self.language_label = QLabel(texts['language'])
         language_layout.addWidget(self.language_label)
         self.language_combo = QComboBox()
         self.language_combo.addItem("中文", "zh_CN")
@@ -971,18 +1248,18 @@ class SpriteAlignerGUI(QMainWindow):
         main_layout.addLayout(language_layout)
         
         # 顶部控制区域
-        self.control_group = QGroupBox(self.language_dict[self.current_language]['control_options'])
+        self.control_group = QGroupBox(texts['control_options'])
         control_layout = QGridLayout(self.control_group)
         # 限制控制选项区域的最大高度
         self.control_group.setMaximumHeight(180)
         
         # 导入图片按钮
-        self.import_btn = QPushButton(self.language_dict[self.current_language]['import_images'])
+        self.import_btn = QPushButton(texts['import_images'])
         self.import_btn.clicked.connect(self.import_images)
         control_layout.addWidget(self.import_btn, 0, 0)
         
         # 网格大小设置
-        self.grid_size_label = QLabel(self.language_dict[self.current_language]['grid_size'])
+        self.grid_size_label = QLabel(texts['grid_size'])
         control_layout.addWidget(self.grid_size_label, 0, 1)
         self.grid_spin = QSpinBox()
         self.grid_spin.setRange(8, 256)
@@ -991,38 +1268,38 @@ class SpriteAlignerGUI(QMainWindow):
         control_layout.addWidget(self.grid_spin, 0, 2)
         
         # 显示选项
-        self.grid_check = QCheckBox(self.language_dict[self.current_language]['show_grid'])
+        self.grid_check = QCheckBox(texts['show_grid'])
         self.grid_check.setChecked(True)
         self.grid_check.stateChanged.connect(self.toggle_grid)
         control_layout.addWidget(self.grid_check, 0, 3)
         
-        self.center_check = QCheckBox(self.language_dict[self.current_language]['show_center'])
+        self.center_check = QCheckBox(texts['show_center'])
         self.center_check.setChecked(True)
         self.center_check.stateChanged.connect(self.toggle_center)
         control_layout.addWidget(self.center_check, 0, 4)
         
         # 当前图片显示选项
-        self.current_image_check = QCheckBox(self.language_dict[self.current_language]['show_current_image'])
+        self.current_image_check = QCheckBox(texts['show_current_image'])
         self.current_image_check.setChecked(True)
         self.current_image_check.stateChanged.connect(self.toggle_current_image)
         control_layout.addWidget(self.current_image_check, 0, 5)
         
         # 参考图选项
-        self.ref_label = QLabel(self.language_dict[self.current_language]['reference_image'])
+        self.ref_label = QLabel(texts['reference_image'])
         control_layout.addWidget(self.ref_label, 1, 0)
         self.ref_combo = QComboBox()
         self.ref_combo.setEnabled(False)
         self.ref_combo.currentIndexChanged.connect(self.set_reference_image)
         control_layout.addWidget(self.ref_combo, 1, 1, 1, 2)
         
-        self.ref_check = QCheckBox(self.language_dict[self.current_language]['show_reference'])
+        self.ref_check = QCheckBox(texts['show_reference'])
         self.ref_check.setChecked(False)
         self.ref_check.stateChanged.connect(self.toggle_reference)
         self.ref_check.setEnabled(False)
         control_layout.addWidget(self.ref_check, 1, 3)
         
         # 参考图透明度
-        self.ref_opacity_label = QLabel(self.language_dict[self.current_language]['reference_opacity'])
+        self.ref_opacity_label = QLabel(texts['reference_opacity'])
         control_layout.addWidget(self.ref_opacity_label, 2, 0)
         self.ref_opacity_slider = QSlider(Qt.Horizontal)
         self.ref_opacity_slider.setRange(10, 100)
@@ -1035,11 +1312,11 @@ class SpriteAlignerGUI(QMainWindow):
         control_layout.addWidget(self.ref_opacity_value_label, 2, 4)
         
         # 工作区缩放控制
-        self.zoom_label_text = QLabel(self.language_dict[self.current_language]['workspace_zoom'])
+        self.zoom_label_text = QLabel(texts['workspace_zoom'])
         control_layout.addWidget(self.zoom_label_text, 3, 0)
         zoom_layout = QHBoxLayout()
         
-        self.zoom_out_btn = QPushButton(self.language_dict[self.current_language]['zoom_out'])
+        self.zoom_out_btn = QPushButton(texts['zoom_out'])
         self.zoom_out_btn.clicked.connect(self.zoom_out)
         self.zoom_out_btn.setEnabled(False)
         zoom_layout.addWidget(self.zoom_out_btn)
@@ -1049,14 +1326,23 @@ class SpriteAlignerGUI(QMainWindow):
         self.zoom_slider.setValue(int(self.zoom_factor * 100))
         self.zoom_slider.setEnabled(False)
         self.zoom_slider.valueChanged.connect(self.update_zoom)
+        # 拖动滑块期间使用快速缩放，松开后再平滑重绘
+        self.zoom_slider.sliderPressed.connect(self.begin_interactive_zoom)
+        self.zoom_slider.sliderReleased.connect(self.end_interactive_zoom)
         zoom_layout.addWidget(self.zoom_slider, 1)
         
-        self.zoom_in_btn = QPushButton(self.language_dict[self.current_language]['zoom_in'])
+        # 滚轮缩放停止一段时间后再平滑重绘
+        self._interactive_timer = QTimer(self)
+        self._interactive_timer.setSingleShot(True)
+        self._interactive_timer.setInterval(150)
+        self._interactive_timer.timeout.connect(self.end_interactive_zoom)
+        
+        self.zoom_in_btn = QPushButton(texts['zoom_in'])
         self.zoom_in_btn.clicked.connect(self.zoom_in)
         self.zoom_in_btn.setEnabled(False)
         zoom_layout.addWidget(self.zoom_in_btn)
         
-        self.reset_zoom_btn = QPushButton(self.language_dict[self.current_language]['reset_zoom'])
+        self.reset_zoom_btn = QPushButton(texts['reset_zoom'])
         self.reset_zoom_btn.clicked.connect(self.reset_zoom)
         self.reset_zoom_btn.setEnabled(False)
         zoom_layout.addWidget(self.reset_zoom_btn)
@@ -1070,7 +1356,7 @@ class SpriteAlignerGUI(QMainWindow):
         work_layout = QHBoxLayout()
         
         # 左侧图片列表
-        self.list_group = QGroupBox(self.language_dict[self.current_language]['image_list'])
+        self.list_group = QGroupBox(texts['image_list'])
         list_layout = QVBoxLayout(self.list_group)
         
         self.image_list = QListWidget()
@@ -1089,22 +1375,22 @@ class SpriteAlignerGUI(QMainWindow):
         # 添加图片排序控制按钮
         order_layout = QHBoxLayout()
         
-        self.move_up_btn = QPushButton(self.language_dict[self.current_language]['move_up'])
+        self.move_up_btn = QPushButton(texts['move_up'])
         self.move_up_btn.clicked.connect(self.move_selected_up)
         self.move_up_btn.setEnabled(False)
         order_layout.addWidget(self.move_up_btn)
         
-        self.move_down_btn = QPushButton(self.language_dict[self.current_language]['move_down'])
+        self.move_down_btn = QPushButton(texts['move_down'])
         self.move_down_btn.clicked.connect(self.move_selected_down)
         self.move_down_btn.setEnabled(False)
         order_layout.addWidget(self.move_down_btn)
         
-        self.set_ref_btn = QPushButton(self.language_dict[self.current_language]['set_as_reference'])
+        self.set_ref_btn = QPushButton(texts['set_as_reference'])
         self.set_ref_btn.clicked.connect(self.set_selected_as_reference)
         self.set_ref_btn.setEnabled(False)
         order_layout.addWidget(self.set_ref_btn)
         
-        self.delete_btn = QPushButton(self.language_dict[self.current_language]['delete_image'])
+        self.delete_btn = QPushButton(texts['delete_image'])
         self.delete_btn.clicked.connect(self.delete_selected_image)
         self.delete_btn.setEnabled(False)
         order_layout.addWidget(self.delete_btn)
@@ -1112,12 +1398,12 @@ class SpriteAlignerGUI(QMainWindow):
         list_layout.addLayout(order_layout)
         
         # 右侧对齐控制
-        self.align_group = QGroupBox(self.language_dict[self.current_language]['alignment_control'])
+        self.align_group = QGroupBox(texts['alignment_control'])
         align_layout = QVBoxLayout(self.align_group)
         
         # X坐标控制
         x_layout = QHBoxLayout()
-        self.x_offset_label = QLabel(self.language_dict[self.current_language]['x_offset'])
+        self.x_offset_label = QLabel(texts['x_offset'])
         x_layout.addWidget(self.x_offset_label)
         self.x_spin = QSpinBox()
         self.x_spin.setRange(-500, 500)
@@ -1128,7 +1414,7 @@ class SpriteAlignerGUI(QMainWindow):
         
         # Y坐标控制
         y_layout = QHBoxLayout()
-        self.y_offset_label = QLabel(self.language_dict[self.current_language]['y_offset'])
+        self.y_offset_label = QLabel(texts['y_offset'])
         y_layout.addWidget(self.y_offset_label)
         self.y_spin = QSpinBox()
         self.y_spin.setRange(-500, 500)
@@ -1138,7 +1424,7 @@ class SpriteAlignerGUI(QMainWindow):
         align_layout.addLayout(y_layout)
         
         # 重置偏移按钮
-        self.reset_btn = QPushButton(self.language_dict[self.current_language]['reset_offset'])
+        self.reset_btn = QPushButton(texts['reset_offset'])
         self.reset_btn.clicked.connect(self.reset_offset)
         align_layout.addWidget(self.reset_btn)
         
@@ -1147,17 +1433,10 @@ class SpriteAlignerGUI(QMainWindow):
         
         # 创建水平布局来容纳标签和下拉框
         auto_label_layout = QHBoxLayout()
-        self.auto_label = QLabel(self.language_dict[self.current_language]['auto_alignment'])
+        self.auto_label = QLabel(texts['auto_alignment'])
         auto_label_layout.addWidget(self.auto_label)
         self.auto_align_combo = QComboBox()
-        self.auto_align_combo.addItems([
-            self.language_dict[self.current_language]['none'],
-            self.language_dict[self.current_language]['left_align'],
-            self.language_dict[self.current_language]['right_align'],
-            self.language_dict[self.current_language]['top_align'],
-            self.language_dict[self.current_language]['bottom_align'],
-            self.language_dict[self.current_language]['center_align']
-        ])
+        self.auto_align_combo.addItems([texts[key] for key in self.ALIGN_TYPES])
         auto_label_layout.addWidget(self.auto_align_combo)
         auto_label_layout.addStretch()  # 添加拉伸空间，将组件靠左对齐
         
@@ -1165,25 +1444,25 @@ class SpriteAlignerGUI(QMainWindow):
         auto_layout.addLayout(auto_label_layout)
         
         # 检查语言字典中是否包含导入导出偏移设置的键
-        if 'export_offset' not in self.language_dict[self.current_language]:
-            self.language_dict[self.current_language]['export_offset'] = '导出偏移设置'
-            self.language_dict[self.current_language]['import_offset'] = '导入偏移设置'
+        if 'export_offset' not in texts:
+            texts['export_offset'] = '导出偏移设置'
+            texts['import_offset'] = '导入偏移设置'
         
         # 单个对齐按钮
-        self.auto_align_btn = QPushButton(self.language_dict[self.current_language]['apply_to_current'])
+        self.auto_align_btn = QPushButton(texts['apply_to_current'])
         self.auto_align_btn.clicked.connect(self.apply_auto_align)
         
         # 批量对齐按钮
-        self.batch_align_btn = QPushButton(self.language_dict[self.current_language]['batch_apply'])
+        self.batch_align_btn = QPushButton(texts['batch_apply'])
         self.batch_align_btn.clicked.connect(self.batch_apply_auto_align)
         
         # 导出偏移设置按钮
-        self.export_offset_btn = QPushButton(self.language_dict[self.current_language]['export_offset'])
+        self.export_offset_btn = QPushButton(texts['export_offset'])
         self.export_offset_btn.clicked.connect(self.export_offset_settings)
         self.export_offset_btn.setEnabled(False)
         
         # 导入偏移设置按钮
-        self.import_offset_btn = QPushButton(self.language_dict[self.current_language]['import_offset'])
+        self.import_offset_btn = QPushButton(texts['import_offset'])
         self.import_offset_btn.clicked.connect(self.import_offset_settings)
         self.import_offset_btn.setEnabled(False)
         
@@ -1194,18 +1473,18 @@ class SpriteAlignerGUI(QMainWindow):
         align_layout.addLayout(auto_layout)
         
         # 中间工作区预览
-        self.preview_group = QGroupBox(self.language_dict[self.current_language]['workspace'])
+        self.preview_group = QGroupBox(texts['workspace'])
         preview_layout = QVBoxLayout(self.preview_group)
         
         # 创建滚动区域
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         
-        self.workspace_label = QLabel()
+        self.workspace_label = WorkspaceWidget()
         self.workspace_label.setAlignment(Qt.AlignCenter)
         self.workspace_label.setMinimumSize(600, 600)
         self.workspace_label.setStyleSheet("border: 1px solid #ccc")
-        self.workspace_label.setText(self.language_dict[self.current_language]['no_image_selected'])
+        self.workspace_label.setText(texts['no_image_selected'])
         self.workspace_label.mousePressEvent = self.workspace_click
         self.workspace_label.mouseMoveEvent = self.workspace_drag
         self.workspace_label.mouseReleaseEvent = self.workspace_release
@@ -1232,26 +1511,31 @@ class SpriteAlignerGUI(QMainWindow):
         work_layout.addWidget(splitter)
         
         # 底部拼接控制
-        self.stitch_group = QGroupBox(self.language_dict[self.current_language]['stitch_settings'])
+        self.stitch_group = QGroupBox(texts['stitch_settings'])
         stitch_layout = QGridLayout(self.stitch_group)
         # 限制拼接设置区域的高度
         self.stitch_group.setMaximumHeight(160)
 
         # 按组拼接选项
-        self.stitch_by_group_check = QCheckBox(self.language_dict[self.current_language]['stitch_by_group'])
+        self.stitch_by_group_check = QCheckBox(texts['stitch_by_group'])
         self.stitch_by_group_check.setChecked(True)  # 默认勾选
         self.stitch_by_group_check.stateChanged.connect(self.toggle_stitch_mode)
         stitch_layout.addWidget(self.stitch_by_group_check, 0, 0, 1, 2)
+        
+        # 紧凑排列选项
+        self.tight_pack_check = QCheckBox(texts['tight_pack'])
+        self.tight_pack_check.stateChanged.connect(self.toggle_stitch_mode)
+        stitch_layout.addWidget(self.tight_pack_check, 0, 2, 1, 2)
 
         # 行列数设置
-        self.columns_label = QLabel(self.language_dict[self.current_language]['columns'])
+        self.columns_label = QLabel(texts['columns'])
         stitch_layout.addWidget(self.columns_label, 1, 0)
         self.cols_spin = QSpinBox()
         self.cols_spin.setRange(1, 100)
         self.cols_spin.setValue(10)
         stitch_layout.addWidget(self.cols_spin, 1, 1)
         
-        self.rows_label = QLabel(self.language_dict[self.current_language]['rows'])
+        self.rows_label = QLabel(texts['rows'])
         stitch_layout.addWidget(self.rows_label, 1, 2)
         self.rows_spin = QSpinBox()
         self.rows_spin.setRange(1, 100)
@@ -1261,14 +1545,14 @@ class SpriteAlignerGUI(QMainWindow):
         self.toggle_stitch_mode()
 
         # 间距设置
-        self.h_spacing_label = QLabel(self.language_dict[self.current_language]['horizontal_spacing'])
+        self.h_spacing_label = QLabel(texts['horizontal_spacing'])
         stitch_layout.addWidget(self.h_spacing_label, 2, 0)
         self.h_spacing_spin = QSpinBox()
         self.h_spacing_spin.setRange(0, 100)
         self.h_spacing_spin.setValue(0)
         stitch_layout.addWidget(self.h_spacing_spin, 2, 1)
         
-        self.v_spacing_label = QLabel(self.language_dict[self.current_language]['vertical_spacing'])
+        self.v_spacing_label = QLabel(texts['vertical_spacing'])
         stitch_layout.addWidget(self.v_spacing_label, 2, 2)
         self.v_spacing_spin = QSpinBox()
         self.v_spacing_spin.setRange(0, 100)
@@ -1277,16 +1561,16 @@ class SpriteAlignerGUI(QMainWindow):
         
         # 单个图片大小设置
         # 首先检查语言字典中是否包含单个图片宽度和高度的键
-        if 'single_image_width' not in self.language_dict[self.current_language]:
-            self.language_dict[self.current_language]['single_image_width'] = '单个图片宽度:'
-            self.language_dict[self.current_language]['single_image_height'] = '单个图片高度:'
+        if 'single_image_width' not in texts:
+            texts['single_image_width'] = '单个图片宽度:'
+            texts['single_image_height'] = '单个图片高度:'
         
         # 检查语言字典中是否包含导入导出偏移设置的键
-        if 'export_offset' not in self.language_dict[self.current_language]:
-            self.language_dict[self.current_language]['export_offset'] = '导出偏移设置'
-            self.language_dict[self.current_language]['import_offset'] = '导入偏移设置'
+        if 'export_offset' not in texts:
+            texts['export_offset'] = '导出偏移设置'
+            texts['import_offset'] = '导入偏移设置'
         
-        self.single_image_width_label = QLabel(self.language_dict[self.current_language]['single_image_width'])
+        self.single_image_width_label = QLabel(texts['single_image_width'])
         stitch_layout.addWidget(self.single_image_width_label, 3, 0)
         self.single_image_width_spin = QSpinBox()
 
@@ -1294,7 +1578,7 @@ class SpriteAlignerGUI(QMainWindow):
         self.single_image_width_spin.setValue(0)
         stitch_layout.addWidget(self.single_image_width_spin, 3, 1)
         
-        self.single_image_height_label = QLabel(self.language_dict[self.current_language]['single_image_height'])
+        self.single_image_height_label = QLabel(texts['single_image_height'])
         stitch_layout.addWidget(self.single_image_height_label, 3, 2)
         self.single_image_height_spin = QSpinBox()
         self.single_image_height_spin.setRange(0, 4096)
@@ -1304,11 +1588,16 @@ class SpriteAlignerGUI(QMainWindow):
         # 底部按钮区域
         button_layout = QHBoxLayout()
         
-        self.stitch_save_btn = QPushButton(self.language_dict[self.current_language]['stitch_save'])
+        self.stitch_save_btn = QPushButton(texts['stitch_save'])
         self.stitch_save_btn.clicked.connect(self.stitch_and_save_sprites)
         self.stitch_save_btn.setEnabled(False)
         button_layout.addWidget(self.stitch_save_btn)
         
+        # 拼接进度条（拼接时显示）
+        self.stitch_progress_bar = QProgressBar()
+        self.stitch_progress_bar.setVisible(False)
+        button_layout.addWidget(self.stitch_progress_bar)
+        
         # 添加到主布局
         main_layout.addWidget(self.control_group)
         main_layout.addLayout(work_layout)
@@ -1322,15 +1611,9 @@ class SpriteAlignerGUI(QMainWindow):
         main_layout.setStretch(2, 1)  # 底部拼接设置
         main_layout.setStretch(3, 1)  # 底部按钮区域
         
-        # 设置中心部件
-        central_widget = QWidget()
-        central_widget.setLayout(main_layout)
-        self.setCentralWidget(central_widget)
-        
         # 初始化变量
         self.dragging = False
         self.last_pos = QPoint()
-        self.workspace_pixmap = None
         self.stitch_result = None
     
     def import_images(self):
@@ -1383,6 +1666,9 @@ class SpriteAlignerGUI(QMainWindow):
         # 清空之前的数据
         self.image_files = []
         self.images_data = []
+        self._pixmap_cache.clear()
+        self._sprite_array_cache.clear()
+        QPixmapCache.clear()
         self.image_list.clear()
         self.ref_combo.clear()
         
@@ -1404,35 +1690,55 @@ class SpriteAlignerGUI(QMainWindow):
                             file_path = os.path.join(root, file)
                             all_image_files.append((folder_path, file_path))
         
+        # 并行读取所有文件头（主要是等待磁盘），map按原顺序返回结果
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            headers = list(executor.map(_read_image_header, [file_path for _, file_path in all_image_files]))
+        
         # 添加图片文件
-        for folder_path, file_path in all_image_files:
+        failed_files = []
+        for (folder_path, file_path), header in zip(all_image_files, headers):
+            if header is None:
+                # 文件损坏或无法识别，跳过，导入完成后统一提示
+                failed_files.append(file_path)
+                continue
+            width, height, image_format = header
             self.image_files.append(file_path)
-            # 为每个图片创建数据结构：(文件名, 偏移量x, 偏移量y, 原始图片尺寸)
-            with Image.open(file_path) as img:
-                width, height = img.size
-                self.images_data.append({
-                    'file_path': file_path,
-                    'offset_x': 0,
-                    'offset_y': 0,
-                    'width': width,
-                    'height': height
-                })
-            # 添加到列表，带文件夹前缀
+            # 列表显示名称，带文件夹前缀
             group_name = os.path.basename(folder_path)
             filename = os.path.basename(file_path)
             display_name = f"[{group_name}] {filename}"
+            # 为每个图片创建数据结构：(文件名, 偏移量x, 偏移量y, 原始图片尺寸)
+            img_data = {
+                'file_path': file_path,
+                'display_name': display_name,
+                'basename': filename,
+                'offset_x': 0,
+                'offset_y': 0,
+                'width': width,
+                'height': height,
+                'opaque': image_format in self.OPAQUE_FORMATS
+            }
+            self.images_data.append(img_data)
+            # 添加到列表，列表项和下拉框项都记录对应图片数据的标识，重排时不依赖可能重名的显示文本
             self.image_list.addItem(display_name)
-            self.ref_combo.addItem(display_name)
+            self.image_list.item(self.image_list.count() - 1).setData(Qt.UserRole, id(img_data))
+            self.ref_combo.addItem(display_name, id(img_data))
+        
+        self._update_pixmap_cache_limit()
+        
+        if failed_files:
+            QMessageBox.warning(self, self.language_dict[self.current_language]['warning'],
+                               self.language_dict[self.current_language]['cannot_load_image'].format('\n'.join(failed_files)))
         
         QMessageBox.information(self, self.language_dict[self.current_language]['success'], 
-                               self.language_dict[self.current_language]['success_imported'].format(len(all_image_files)))
+                               self.language_dict[self.current_language]['success_imported'].format(len(self.images_data)))
         
         self.stitch_save_btn.setEnabled(True)
         self.export_offset_btn.setEnabled(True)
         self.import_offset_btn.setEnabled(True)
         
         # 启用相关控件
-        if len(all_image_files) > 0:
+        if len(self.images_data) > 0:
             self.ref_combo.setEnabled(True)
             self.ref_check.setEnabled(True)
             self.ref_opacity_slider.setEnabled(True)
@@ -1459,8 +1765,7 @@ class SpriteAlignerGUI(QMainWindow):
         
         # 更新偏移量控件
         if 0 <= self.selected_index < len(self.images_data):
-            self.x_spin.setValue(self.images_data[self.selected_index]['offset_x'])
-            self.y_spin.setValue(self.images_data[self.selected_index]['offset_y'])
+            self._sync_offset_spins(self.images_data[self.selected_index])
         
         # 启用/禁用相关按钮
         self.set_ref_btn.setEnabled(True)
@@ -1478,8 +1783,6 @@ class SpriteAlignerGUI(QMainWindow):
     
     def show_image_context_menu(self, pos):
         """显示图片列表的上下文菜单"""
-        from PyQt5.QtWidgets import QMenu
-        
         # 获取当前选中的项目
         item = self.image_list.itemAt(pos)
         if item:
@@ -1501,7 +1804,7 @@ class SpriteAlignerGUI(QMainWindow):
             self.ref_combo.setCurrentIndex(self.selected_index)
             QMessageBox.information(self, self.language_dict[self.current_language]['success'], 
                                    self.language_dict[self.current_language]['success_set_reference'].format(
-                                       os.path.basename(self.images_data[self.selected_index]['file_path'])))
+                                       self.images_data[self.selected_index]['basename']))
             self.update_workspace()
     
     def delete_selected_image(self):
@@ -1516,7 +1819,7 @@ class SpriteAlignerGUI(QMainWindow):
         
         # 获取要删除的图片信息
         img_data = self.images_data[delete_index]
-        img_name = os.path.basename(img_data['file_path'])
+        img_name = img_data['basename']
         
         # 显示确认对话框
         reply = QMessageBox.question(
@@ -1530,24 +1833,23 @@ class SpriteAlignerGUI(QMainWindow):
             # 1. 从图片列表中删除
             self.image_list.takeItem(delete_index)
             
-            # 2. 从数据列表中删除
+            # 2. 从数据列表中删除，并清除对应的图片缓存
             del self.images_data[delete_index]
+            self._pixmap_cache.pop(img_data['file_path'], None)
+            self._sprite_array_cache.pop(img_data['file_path'], None)
             
             # 3. 从文件路径列表中删除对应的项
             if delete_index < len(self.image_files):
                 del self.image_files[delete_index]
             
-            # 4. 更新参考图下拉框
+            # 4. 更新参考图下拉框（参考图索引随之更新，删除的是参考图时变为-1）
+            ref_deleted = self.ref_index == delete_index
             self.update_ref_combo_order()
             
-            # 5. 检查是否删除的是参考图
-            if self.ref_index == delete_index:
-                self.ref_index = -1
+            # 5. 删除的是参考图时关闭参考图显示
+            if ref_deleted:
                 self.show_ref = False
                 self.ref_check.setChecked(False)
-            elif self.ref_index > delete_index:
-                # 如果参考图索引大于删除的索引，需要递减
-                self.ref_index -= 1
             
             # 6. 更新当前选中索引
             total_items = self.image_list.count()
@@ -1624,95 +1926,143 @@ class SpriteAlignerGUI(QMainWindow):
     
     def update_images_data_order(self):
         """根据图片列表的顺序更新images_data列表和image_files列表"""
-        new_order = []
-        new_files_order = []
-        for i in range(self.image_list.count()):
-            # 获取项目文本
-            item_text = self.image_list.item(i).text()
-            # 找到对应的图片数据
-            for img_data in self.images_data:
-                if os.path.basename(img_data['file_path']) == item_text:
-                    new_order.append(img_data)
-                    # 添加到新的文件路径列表
-                    new_files_order.append(img_data['file_path'])
-                    break
+        # 按列表项记录的图片数据标识建立索引，一次遍历完成重排
+        lookup = {id(img_data): img_data for img_data in self.images_data}
         # 更新images_data列表
-        self.images_data = new_order
+        self.images_data = [lookup[self.image_list.item(i).data(Qt.UserRole)] for i in range(self.image_list.count())]
         # 更新image_files列表
-        self.image_files = new_files_order
+        self.image_files = [img_data['file_path'] for img_data in self.images_data]
         # 更新参考图下拉框
         self.update_ref_combo_order()
     
     def update_ref_combo_order(self):
         """更新参考图下拉框的顺序"""
-        # 保存当前选中的索引
-        current_index = self.ref_combo.currentIndex()
-        current_text = self.ref_combo.currentText() if current_index >= 0 else ""
+        # 保存当前选中项对应的图片数据标识
+        current_data = self.ref_combo.currentData()
+        
+        # 重建期间屏蔽信号，避免清空和逐项添加时反复触发参考图切换和工作区重绘
+        self.ref_combo.blockSignals(True)
         
         # 清空下拉框
         self.ref_combo.clear()
         
         # 重新添加项目
         for img_data in self.images_data:
-            self.ref_combo.addItem(os.path.basename(img_data['file_path']))
-        
-        # 恢复选中状态
-        if current_text:
-            new_index = self.ref_combo.findText(current_text)
-            if new_index >= 0:
-                self.ref_combo.setCurrentIndex(new_index)
-                self.ref_index = new_index
-    
-    def update_workspace(self):
-        """更新工作区显示"""
-        if self.selected_index < 0 or self.selected_index >= len(self.images_data):
-            return
+            self.ref_combo.addItem(img_data['display_name'], id(img_data))
         
-        # 获取当前选中的图片数据
-        img_data = self.images_data[self.selected_index]
-        file_path = img_data['file_path']
-        offset_x = img_data['offset_x']
-        offset_y = img_data['offset_y']
+        # 恢复选中状态（按图片数据标识查找，显示名称重复时也不会选错），原参考图已不存在时不选中任何项
+        new_index = self.ref_combo.findData(current_data) if current_data is not None else -1
+        self.ref_combo.setCurrentIndex(new_index)
+        self.ref_index = new_index
         
-        # 加载图片
-        pixmap = QPixmap(file_path)
-        if pixmap.isNull():
-            QMessageBox.warning(self, self.language_dict[self.current_language]['warning'], 
-                               self.language_dict[self.current_language]['cannot_load_image'].format(file_path))
-            return
-        
-        # 创建工作区画布
-        workspace_size = 600
-        self.workspace_pixmap = QPixmap(workspace_size, workspace_size)
-        self.workspace_pixmap.fill(QColor(240, 240, 240))
+        self.ref_combo.blockSignals(False)
+    
+    def _update_pixmap_cache_limit(self):
+        """按已导入图片解码后的总大小调整QPixmapCache上限，取其四分之一并限制在32MB到256MB之间"""
+        total_kb = sum(img_data['width'] * img_data['height'] * 4 for img_data in self.images_data) // 1024
+        QPixmapCache.setCacheLimit(max(32 * 1024, min(256 * 1024, total_kb // 4)))
+    
+    def _get_pixmap(self, path):
+        """获取图片的QPixmap，首次访问时从拼接用的RGBA数组生成并缓存"""
+        pixmap = self._pixmap_cache.get(path)
+        if pixmap is None:
+            # 与拼接共用同一份解码结果，直接引用数组内存构造QImage，同一文件不再由Qt重复解码
+            try:
+                arr = self._get_sprite_array(path)[0]
+            except OSError:
+                # 文件不存在或无法解码（PIL的UnidentifiedImageError也是OSError的子类），
+                # 返回空QPixmap由调用方提示无法加载；不缓存，文件恢复后可重新加载
+                return QPixmap()
+            height, width = arr.shape[:2]
+            image = QImage(arr.data, width, height, arr.strides[0], QImage.Format_RGBA8888)
+            pixmap = QPixmap.fromImage(image)
+            self._pixmap_cache[path] = pixmap
+        return pixmap
+    
+    def _get_scaled_pixmap(self, path, width, height):
+        """获取缩放到指定尺寸的QPixmap，同一缩放级别下重复绘制时直接复用"""
+        pixmap = self._get_pixmap(path)
+        if pixmap.width() == width and pixmap.height() == height:
+            # 100%缩放时无需重新采样
+            return pixmap
+        
+        # 连续缩放交互中使用快速缩放，交互结束后再平滑缩放
+        mode = Qt.FastTransformation if self._interactive else Qt.SmoothTransformation
+        key = f"scaled:{path}:{width}x{height}:{int(mode)}"
+        scaled_pixmap = QPixmapCache.find(key)
+        if scaled_pixmap is None:
+            if self._interactive:
+                # 从最接近的多级缩放图快速缩放，避免每个缩放级别都对原图重新采样
+                scale = width / pixmap.width() if pixmap.width() else 1.0
+                pixmap = self._get_pyramid_level(path, scale)
+            scaled_pixmap = pixmap.scaled(width, height, Qt.IgnoreAspectRatio, mode)
+            QPixmapCache.insert(key, scaled_pixmap)
+        return scaled_pixmap
+    
+    def _get_faded_pixmap(self, pixmap, opacity):
+        """获取按透明度预先混合的QPixmap，同一图片和透明度下直接复用"""
+        key = f"faded:{pixmap.cacheKey()}:{opacity}"
+        faded_pixmap = QPixmapCache.find(key)
+        if faded_pixmap is None:
+            faded_pixmap = QPixmap(pixmap.size())
+            faded_pixmap.fill(Qt.transparent)
+            painter = QPainter(faded_pixmap)
+            painter.setOpacity(opacity)
+            painter.drawPixmap(0, 0, pixmap)
+            painter.end()
+            QPixmapCache.insert(key, faded_pixmap)
+        return faded_pixmap
+    
+    def _get_pyramid_level(self, path, scale):
+        """获取不小于目标缩放倍数的最近一级平滑缩放图（放大时为原图），各级在首次使用时生成"""
+        level = next((s for s in self.PYRAMID_SCALES if s >= scale), self.PYRAMID_SCALES[-1])
+        pixmap = self._get_pixmap(path)
+        if level == 1:
+            return pixmap
+        
+        key = f"pyramid:{path}:{level}"
+        level_pixmap = QPixmapCache.find(key)
+        if level_pixmap is None:
+            level_pixmap = pixmap.scaled(max(1, int(pixmap.width() * level)), max(1, int(pixmap.height() * level)),
+                                         Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            QPixmapCache.insert(key, level_pixmap)
+        return level_pixmap
+    
+    def _get_grid_lines(self, scaled_grid_size, workspace_size):
+        """获取网格线段列表，网格间距和工作区大小不变时直接复用"""
+        key = (scaled_grid_size, workspace_size)
+        if self._grid_lines_cache[0] != key:
+            # 水平网格线 + 垂直网格线
+            lines = [QLine(0, y, workspace_size, y) for y in range(0, workspace_size, scaled_grid_size)]
+            lines += [QLine(x, 0, x, workspace_size) for x in range(0, workspace_size, scaled_grid_size)]
+            self._grid_lines_cache = (key, lines)
+        return self._grid_lines_cache[1]
+    
+    def _render_background(self, workspace_size):
+        """绘制工作区背景：底色、网格和中心点"""
+        background = QPixmap(workspace_size, workspace_size)
+        background.fill(QColor(240, 240, 240))
         
         # 获取中心坐标
         center_x = workspace_size // 2
         center_y = workspace_size // 2
         
+        # 网格和中心点用同一个QPainter绘制
+        painter = QPainter(background)
+        
         # 绘制网格（应用缩放）
         if self.show_grid:
-            painter = QPainter(self.workspace_pixmap)
             pen = QPen(QColor(200, 200, 200), 1, Qt.DotLine)
             painter.setPen(pen)
             
-            # 计算缩放后的网格间距
-            scaled_grid_size = int(self.grid_size * self.zoom_factor)
-            
-            # 绘制水平网格线
-            for y in range(0, workspace_size, scaled_grid_size):
-                painter.drawLine(0, y, workspace_size, y)
+            # 计算缩放后的网格间距（最小为1像素）
+            scaled_grid_size = max(1, int(self.grid_size * self.zoom_factor))
             
-            # 绘制垂直网格线
-            for x in range(0, workspace_size, scaled_grid_size):
-                painter.drawLine(x, 0, x, workspace_size)
-            
-            painter.end()
+            # 一次性绘制所有网格线
+            painter.drawLines(self._get_grid_lines(scaled_grid_size, workspace_size))
         
         # 绘制中心点（应用缩放）
         if self.show_center:
-            painter = QPainter(self.workspace_pixmap)
-            
             # 绘制中心十字线
             pen = QPen(QColor(255, 0, 0), 2, Qt.SolidLine)
             painter.setPen(pen)
@@ -1726,8 +2076,74 @@ class SpriteAlignerGUI(QMainWindow):
             painter.setPen(pen)
             radius = int(5 * self.zoom_factor)
             painter.drawEllipse(QPoint(center_x, center_y), radius, radius)
-            
-            painter.end()
+        
+        painter.end()
+        
+        return background
+    
+    def update_workspace(self):
+        """请求更新工作区显示，同一轮事件循环内的多次请求合并为一次重绘"""
+        if self._update_pending:
+            return
+        self._update_pending = True
+        QTimer.singleShot(0, self._do_update_workspace)
+    
+    def _do_update_workspace(self):
+        """执行工作区重绘"""
+        self._update_pending = False
+        if self.selected_index < 0 or self.selected_index >= len(self.images_data):
+            return
+        
+        self._rebuild_background()
+        self._composite_foreground()
+    
+    def _rebuild_background(self):
+        """重建工作区背景（底色、网格和中心点），只在缩放、网格、中心点或工作区大小变化时重新绘制"""
+        workspace_size = self.workspace_size
+        key = (self.zoom_factor, self.grid_size, self.show_grid, self.show_center, workspace_size)
+        if key == self._bg_key and self._bg_pixmap is not None:
+            # 背景未变化，沿用同一个QPixmap，工作区只重绘变化的前景图层
+            return
+        
+        # 按绘制参数缓存到QPixmapCache中，滚轮来回缩放时直接复用各缩放级别已绘制的背景
+        cache_key = f"workspace_bg:{key}"
+        background = QPixmapCache.find(cache_key)
+        if background is None:
+            background = self._render_background(workspace_size)
+            QPixmapCache.insert(cache_key, background)
+        self._bg_pixmap = background
+        self._bg_key = key
+    
+    def _composite_foreground(self):
+        """计算当前图片和参考图图层，并更新工作区显示
+        
+        只有偏移量变化时直接调用此方法，无需重建背景。
+        """
+        if self.selected_index < 0 or self.selected_index >= len(self.images_data):
+            return
+        if self._bg_pixmap is None:
+            self._rebuild_background()
+        
+        # 获取当前选中的图片数据
+        img_data = self.images_data[self.selected_index]
+        file_path = img_data['file_path']
+        offset_x = img_data['offset_x']
+        offset_y = img_data['offset_y']
+        
+        # 加载图片（优先使用缓存）
+        pixmap = self._get_pixmap(file_path)
+        if pixmap.isNull():
+            QMessageBox.warning(self, self.language_dict[self.current_language]['warning'],
+                               self.language_dict[self.current_language]['cannot_load_image'].format(file_path))
+            return
+        
+        # 收集要叠加在背景上的图层
+        workspace_size = self.workspace_size
+        layers = []
+        
+        # 获取中心坐标
+        center_x = workspace_size // 2
+        center_y = workspace_size // 2
         
         # 计算当前图片位置和缩放后的尺寸（考虑偏移量和缩放）
         img_width = pixmap.width()
@@ -1747,21 +2163,14 @@ class SpriteAlignerGUI(QMainWindow):
         
         # 绘制当前图片（应用缩放）
         if self.current_image_visible:
-            painter = QPainter(self.workspace_pixmap)
-            scaled_pixmap = pixmap.scaled(scaled_img_width, scaled_img_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            painter.drawPixmap(x, y, scaled_pixmap)
-            painter.end()
+            scaled_pixmap = self._get_scaled_pixmap(file_path, scaled_img_width, scaled_img_height)
+            layers.append((x, y, scaled_pixmap, 1.0, img_data['opaque']))
         
         # 绘制参考图（如果启用，应用缩放）
         if self.show_ref and self.ref_index >= 0 and self.ref_index < len(self.images_data):
             ref_data = self.images_data[self.ref_index]
-            ref_pixmap = QPixmap(ref_data['file_path'])
+            ref_pixmap = self._get_pixmap(ref_data['file_path'])
             if not ref_pixmap.isNull():
-                painter = QPainter(self.workspace_pixmap)
-                
-                # 设置透明度
-                painter.setOpacity(self.ref_opacity)
-                
                 # 计算参考图位置和缩放后的尺寸
                 ref_width = ref_pixmap.width()
                 ref_height = ref_pixmap.height()
@@ -1780,14 +2189,16 @@ class SpriteAlignerGUI(QMainWindow):
                 ref_x = center_x - scaled_ref_width // 2 + scaled_ref_offset_x
                 ref_y = center_y - scaled_ref_height // 2 + scaled_ref_offset_y
                 
-                # 缩放参考图并绘制
-                scaled_ref_pixmap = ref_pixmap.scaled(scaled_ref_width, scaled_ref_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                painter.drawPixmap(ref_x, ref_y, scaled_ref_pixmap)
-                
-                painter.end()
+                # 缩放参考图；参考图不透明且透明度为100%时直接覆盖，跳过逐像素混合
+                scaled_ref_pixmap = self._get_scaled_pixmap(ref_data['file_path'], scaled_ref_width, scaled_ref_height)
+                copy = ref_data['opaque'] and self.ref_opacity >= 0.999
+                if not copy and self.ref_opacity < 0.999:
+                    # 透明度预先混合进参考图，绘制时不再逐像素乘以透明度
+                    scaled_ref_pixmap = self._get_faded_pixmap(scaled_ref_pixmap, self.ref_opacity)
+                layers.append((ref_x, ref_y, scaled_ref_pixmap, 1.0, copy))
         
-        # 更新工作区显示
-        self.workspace_label.setPixmap(self.workspace_pixmap)
+        # 更新工作区显示，只重绘图层变化的区域
+        self.workspace_label.set_layers(self._bg_pixmap, layers)
     
     def set_reference_image(self, index):
         """设置参考图"""
@@ -1825,6 +2236,17 @@ class SpriteAlignerGUI(QMainWindow):
         self.update_zoom_display()
         self.update_workspace()
     
+    def begin_interactive_zoom(self):
+        """开始连续缩放交互"""
+        self._interactive = True
+    
+    def end_interactive_zoom(self):
+        """结束连续缩放交互，以平滑缩放重绘工作区"""
+        self._interactive_timer.stop()
+        if self._interactive:
+            self._interactive = False
+            self.update_workspace()
+    
     def update_zoom_display(self):
         """更新缩放显示"""
         # 更新滑块值
@@ -1901,6 +2323,10 @@ class SpriteAlignerGUI(QMainWindow):
         # 获取滚轮滚动方向
         delta = event.angleDelta().y()
         
+        # 滚轮连续缩放期间使用快速缩放
+        self.begin_interactive_zoom()
+        self._interactive_timer.start()
+        
         # 计算新的缩放因子
         zoom_step = 0.1  # 每次滚动的缩放步长
         if delta > 0:
@@ -1930,11 +2356,22 @@ class SpriteAlignerGUI(QMainWindow):
             img_data['offset_y'] += delta_y
             
             # 更新控件值
-            self.x_spin.setValue(img_data['offset_x'])
-            self.y_spin.setValue(img_data['offset_y'])
+            self._sync_offset_spins(img_data)
             
-            # 更新工作区显示
-            self.update_workspace()
+            # 只有偏移量变化，仅重新合成前景
+            self._composite_foreground()
+    
+    def _sync_offset_spins(self, img_data):
+        """将图片偏移量写入偏移量控件，不触发valueChanged信号"""
+        self.x_spin.blockSignals(True)
+        self.y_spin.blockSignals(True)
+        self.x_spin.setValue(img_data['offset_x'])
+        self.y_spin.setValue(img_data['offset_y'])
+        self.x_spin.blockSignals(False)
+        self.y_spin.blockSignals(False)
+        # 控件有取值范围，超出范围的偏移量按控件值回写
+        img_data['offset_x'] = self.x_spin.value()
+        img_data['offset_y'] = self.y_spin.value()
     
     def toggle_center(self):
         """切换中心点显示"""
@@ -1953,21 +2390,27 @@ class SpriteAlignerGUI(QMainWindow):
             offset_y = self.y_spin.value()
             self.images_data[self.selected_index]['offset_x'] = offset_x
             self.images_data[self.selected_index]['offset_y'] = offset_y
-            self.update_workspace()
+            self._composite_foreground()
     
     def reset_offset(self):
         """重置当前图片的偏移量"""
         if 0 <= self.selected_index < len(self.images_data):
             self.images_data[self.selected_index]['offset_x'] = 0
             self.images_data[self.selected_index]['offset_y'] = 0
-            self.x_spin.setValue(0)
-            self.y_spin.setValue(0)
-            self.update_workspace()
+            self._sync_offset_spins(self.images_data[self.selected_index])
+            self._composite_foreground()
+    
+    def current_align_key(self):
+        """获取自动对齐下拉框当前选项对应的语言键"""
+        index = self.auto_align_combo.currentIndex()
+        if 0 <= index < len(self.ALIGN_TYPES):
+            return self.ALIGN_TYPES[index]
+        return 'none'
     
     def apply_auto_align(self):
         """应用自动对齐到当前图片"""
-        align_type = self.auto_align_combo.currentText()
-        if align_type == self.language_dict[self.current_language]['none'] or self.selected_index < 0:
+        align_key = self.current_align_key()
+        if align_key == 'none' or self.selected_index < 0:
             return
         
         # 获取当前图片数据
@@ -1976,7 +2419,7 @@ class SpriteAlignerGUI(QMainWindow):
         img_height = img_data['height']
         
         # 计算偏移量
-        offset_x, offset_y, update_x, update_y = self.calculate_align_offset(img_width, img_height, align_type)
+        offset_x, offset_y, update_x, update_y = self.calculate_align_offset(img_width, img_height, align_key)
         
         # 更新偏移量（只更新相关方向）
         if update_x:
@@ -1985,8 +2428,7 @@ class SpriteAlignerGUI(QMainWindow):
             self.images_data[self.selected_index]['offset_y'] = offset_y
         
         # 更新控件值
-        self.x_spin.setValue(self.images_data[self.selected_index]['offset_x'])
-        self.y_spin.setValue(self.images_data[self.selected_index]['offset_y'])
+        self._sync_offset_spins(self.images_data[self.selected_index])
         
         # 更新工作区显示
         self.update_workspace()
@@ -1994,7 +2436,9 @@ class SpriteAlignerGUI(QMainWindow):
     def batch_apply_auto_align(self):
         """批量应用自动对齐到所有图片"""
         align_type = self.auto_align_combo.currentText()
-        if align_type == self.language_dict[self.current_language]['none']:
+        # 对齐类型只解析一次，循环中不再逐个比较翻译文本
+        align_key = self.current_align_key()
+        if align_key == 'none':
             QMessageBox.warning(self, self.language_dict[self.current_language]['warning'], 
                               self.language_dict[self.current_language]['please_select_align_type'])
             return
@@ -2008,85 +2452,49 @@ class SpriteAlignerGUI(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
-            # 批量应用对齐方案
-            for i, img_data in enumerate(self.images_data):
-                img_width = img_data['width']
-                img_height = img_data['height']
-                
-                # 计算偏移量
-                offset_x, offset_y, update_x, update_y = self.calculate_align_offset(img_width, img_height, align_type)
-                
-                # 更新偏移量（只更新相关方向）
-                if update_x:
-                    self.images_data[i]['offset_x'] = offset_x
-                if update_y:
-                    self.images_data[i]['offset_y'] = offset_y
+            # 批量应用对齐方案：整列计算偏移量，只更新相关方向
+            direction_x, direction_y = self.ALIGN_DIRECTIONS[align_key]
+            if direction_x is not None:
+                offsets_x = direction_x * self._column('width') // 2
+                for img_data, offset_x in zip(self.images_data, offsets_x.tolist()):
+                    img_data['offset_x'] = offset_x
+            if direction_y is not None:
+                offsets_y = direction_y * self._column('height') // 2
+                for img_data, offset_y in zip(self.images_data, offsets_y.tolist()):
+                    img_data['offset_y'] = offset_y
             
             # 更新当前选中图片的控件值
             if self.selected_index >= 0 and self.selected_index < len(self.images_data):
                 current_img = self.images_data[self.selected_index]
-                self.x_spin.setValue(current_img['offset_x'])
-                self.y_spin.setValue(current_img['offset_y'])
+                self._sync_offset_spins(current_img)
             
             # 更新工作区显示
             self.update_workspace()
             
-            # 显示成功消息
-            QMessageBox.information(self, self.language_dict[self.current_language]['success'], 
-                                   self.language_dict[self.current_language]['batch_align_success'].format(align_type, len(self.images_data)))
-    
-    def calculate_align_offset(self, img_width, img_height, align_type):
-        """计算对齐偏移量"""
-        # 重新计算对齐逻辑，确保所有对齐都基于图片中心点
-        # 工作区中心点是参考点，图片中心点需要对齐到特定位置
-        offset_x = 0
-        offset_y = 0
-        update_x = False
-        update_y = False
-        
-        if align_type == self.language_dict[self.current_language]['center_align']:
-            # 图片中心点精确对齐到工作区中心点
-            offset_x = 0
-            offset_y = 0
-            update_x = True
-            update_y = True
-        elif align_type == self.language_dict[self.current_language]['left_align']:
-            # 图片中心点对齐到工作区中心点左侧，距离为图片宽度的一半
-            offset_x = -img_width // 2
-            update_x = True
-            update_y = False
-        elif align_type == self.language_dict[self.current_language]['right_align']:
-            # 图片中心点对齐到工作区中心点右侧，距离为图片宽度的一半
-            offset_x = img_width // 2
-            update_x = True
-            update_y = False
-        elif align_type == self.language_dict[self.current_language]['top_align']:
-            # 图片中心点对齐到工作区中心点上方，距离为图片高度的一半
-            offset_y = -img_height // 2
-            update_x = False
-            update_y = True
-        elif align_type == self.language_dict[self.current_language]['bottom_align']:
-            # 图片中心点对齐到工作区中心点下方，距离为图片高度的一半
-            offset_y = img_height // 2
-            update_x = False
-            update_y = True
-        else:
-            offset_x = 0
-            offset_y = 0
-            update_x = False
-            update_y = False
-        
+            # 显示成功消息：放到事件队列中，在工作区重绘之后再弹出
+            title = self.language_dict[self.current_language]['success']
+            message = self.language_dict[self.current_language]['batch_align_success'].format(align_type, len(self.images_data))
+            QTimer.singleShot(0, lambda: QMessageBox.information(self, title, message))
+    
+    def calculate_align_offset(self, img_width, img_height, align_key):
+        """计算对齐偏移量，align_key 为 ALIGN_TYPES 中的语言键"""
+        # 所有对齐都基于图片中心点，偏移量为对应方向上图片尺寸的一半
+        direction_x, direction_y = self.ALIGN_DIRECTIONS.get(align_key, (None, None))
+        update_x = direction_x is not None
+        update_y = direction_y is not None
+        offset_x = direction_x * img_width // 2 if update_x else 0
+        offset_y = direction_y * img_height // 2 if update_y else 0
         return offset_x, offset_y, update_x, update_y
     
     def workspace_click(self, event):
         """工作区鼠标点击事件"""
-        if self.workspace_pixmap:
+        if self.workspace_label.bg is not None:
             self.dragging = True
             self.last_pos = event.pos()
     
     def workspace_drag(self, event):
         """工作区鼠标拖动事件"""
-        if self.dragging and self.workspace_pixmap:
+        if self.dragging and self.workspace_label.bg is not None:
             # 计算拖动偏移量
             delta = event.pos() - self.last_pos
             
@@ -2095,287 +2503,400 @@ class SpriteAlignerGUI(QMainWindow):
                 # 将鼠标移动的像素值除以缩放因子，得到原始像素偏移量
                 adjusted_delta_x = int(delta.x() / self.zoom_factor)
                 adjusted_delta_y = int(delta.y() / self.zoom_factor)
+                if adjusted_delta_x == 0 and adjusted_delta_y == 0:
+                    # 移动不足一个原始像素，偏移量不变，无需重绘；
+                    # 保留起点，让放大时缓慢拖动的位移继续累积
+                    return
                 
                 self.images_data[self.selected_index]['offset_x'] += adjusted_delta_x
                 self.images_data[self.selected_index]['offset_y'] += adjusted_delta_y
                 
                 # 更新控件值
-                self.x_spin.setValue(self.images_data[self.selected_index]['offset_x'])
-                self.y_spin.setValue(self.images_data[self.selected_index]['offset_y'])
+                self._sync_offset_spins(self.images_data[self.selected_index])
                 
-                self.update_workspace()
+                self._composite_foreground()
                 self.last_pos = event.pos()
     
     def workspace_release(self, event):
         """工作区鼠标释放事件"""
         self.dragging = False
     
-    def stitch_sprites(self):
-        """将对齐后的精灵图重新拼接成完整的精灵图表"""
-        if not self.images_data:
-            QMessageBox.warning(self, self.language_dict[self.current_language]['warning'], 
-                               self.language_dict[self.current_language]['please_import_images'])
-            return
+    def _column(self, key, items=None):
+        """将图片数据中的某个整数字段取出为numpy数组，默认取全部图片"""
+        if items is None:
+            items = self.images_data
+        return np.fromiter((img_data[key] for img_data in items), np.int64, len(items))
+    
+    def _get_sprite_array(self, path):
+        """获取拼接用的RGBA数组、alpha类型和是否以自身为蒙版粘贴，文件未修改时复用上次的解码结果
         
-        try:
-            cols = self.cols_spin.value()
-            rows = self.rows_spin.value()
-            h_spacing = self.h_spacing_spin.value()
-            v_spacing = self.v_spacing_spin.value()
-            
-            # 获取用户指定的单个图片大小（如果有）
-            single_width = self.single_image_width_spin.value()
-            single_height = self.single_image_height_spin.value()
+        Returns:
+            tuple: (RGBA数组, alpha类型, 是否以自身为蒙版)。与PIL的paste一致，只有RGBA图片以自身为蒙版；
+                   其他带透明信息的模式（LA、PA、带透明色的调色板图片等）转换后的alpha只在填充到透明单元格后才起作用
+        """
+        mtime = os.path.getmtime(path)
+        entry = self._sprite_array_cache.get(path)
+        if entry is None or entry[0] != mtime:
+            with _pil_image().open(path) as img:
+                arr = np.asarray(img.convert('RGBA'))
+                # 源图片带透明信息时按转换后的alpha分类，只有确实没有透明信息的模式才直接视为不透明
+                has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+                alpha_mode = self._classify_alpha(arr) if has_alpha else 'opaque'
+                self_mask = img.mode == 'RGBA'
+            entry = (mtime, arr, alpha_mode, self_mask)
+            self._sprite_array_cache[path] = entry
+        return entry[1], entry[2], entry[3]
+    
+    def _classify_alpha(self, arr):
+        """判断RGBA数组的alpha类型，决定粘贴时的处理方式
+        
+        Returns:
+            str: 'opaque'（全不透明，直接复制）、'empty'（全透明，跳过）、
+                 'binary'（只有全透明和全不透明像素，按蒙版复制）或'blend'（需要逐像素混合）
+        """
+        alpha = arr[..., 3]
+        if alpha.size == 0:
+            return 'empty'
+        alpha_min, alpha_max = int(alpha.min()), int(alpha.max())
+        if alpha_min == 255:
+            return 'opaque'
+        if alpha_max == 0:
+            return 'empty'
+        if not ((alpha > 0) & (alpha < 255)).any():
+            return 'binary'
+        return 'blend'
+    
+    def _paste_rgba(self, canvas, src, x, y, alpha_mode):
+        """将RGBA数组按alpha类型粘贴到画布的(x, y)处，超出画布的部分会被裁剪"""
+        if alpha_mode == 'empty':
+            # 全透明图片不影响画布
+            return
+        h, w = src.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, canvas.shape[1]), min(y + h, canvas.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+        src = src[y0 - y:y1 - y, x0 - x:x1 - x]
+        dst = canvas[y0:y1, x0:x1]
+        if alpha_mode == 'opaque':
+            # 不透明图片直接整块复制
+            dst[...] = src
+            return
+        alpha = src[..., 3:4]
+        if alpha_mode == 'binary':
+            # 只有全透明和全不透明像素时，按蒙版复制即可，无需逐通道混合
+            np.copyto(dst, src, where=alpha == 255)
+            return
+        # 与PIL带蒙版的paste相同：所有通道按源alpha混合，(v + 128) / 255 的舍入方式也一致
+        # 中间结果最大为 255 * 255 + 128 + 255，uint16 足够，比 uint32 少一半内存读写
+        # 按行分块原地运算：每块只复用两块uint16缓冲区，不为每一步运算分配新的整图临时数组，
+        # 且缓冲区足够小，能留在CPU缓存中
+        h, w = src.shape[:2]
+        block_rows = max(1, self.BLEND_BLOCK_PIXELS // w)
+        tmp = np.empty((min(block_rows, h), w, 4), np.uint16)
+        buf = np.empty_like(tmp)
+        inv = np.empty((min(block_rows, h), w, 1), np.uint8)
+        for row in range(0, h, block_rows):
+            s = src[row:row + block_rows]
+            d = dst[row:row + block_rows]
+            n = s.shape[0]
+            t, b, i = tmp[:n], buf[:n], inv[:n]
+            a = s[..., 3:4]
+            np.multiply(s, a, out=t, dtype=np.uint16)
+            np.subtract(255, a, out=i)
+            np.multiply(d, i, out=b, dtype=np.uint16)
+            t += b
+            t += 128
+            np.right_shift(t, 8, out=b)
+            t += b
+            t >>= 8
+            np.copyto(d, t, casting='unsafe')
+    
+    def _collect_stitch_params(self):
+        """收集拼接参数和图片数据快照，拼接过程中不再访问界面控件"""
+        images = []
+        for i, img_data in enumerate(self.images_data):
+            # 从列表项文本中获取组名
+            list_item_text = self.image_list.item(i).text()
+            group_name = "默认组"
+            # 检查是否包含组名前缀
+            if list_item_text.startswith('['):
+                group_end = list_item_text.find(']')
+                if group_end > 0:
+                    group_name = list_item_text[1:group_end]
             
-            # 1. 首先计算所有图片的原始尺寸和最大尺寸
-            all_images = []
+            images.append({
+                'file_path': img_data['file_path'],
+                'group': group_name,
+                'offset_x': img_data['offset_x'],
+                'offset_y': img_data['offset_y']
+            })
+        
+        return {
+            'cols': self.cols_spin.value(),
+            'rows': self.rows_spin.value(),
+            'h_spacing': self.h_spacing_spin.value(),
+            'v_spacing': self.v_spacing_spin.value(),
+            # 用户指定的单个图片大小（如果有）
+            'single_width': self.single_image_width_spin.value(),
+            'single_height': self.single_image_height_spin.value(),
+            'stitch_by_group': self.stitch_by_group_check.isChecked(),
+            'tight_pack': self.tight_pack_check.isChecked(),
+            'images': images
+        }
+    
+    def _compose_sprite_sheet(self, params, report_progress=None):
+        """根据拼接参数合成精灵图表，不访问界面控件，可在后台线程中调用
+        
+        Args:
+            params (dict): _collect_stitch_params 返回的拼接参数
+            report_progress (callable): 进度回调，参数为0-100的整数
+        """
+        cols = params['cols']
+        rows = params['rows']
+        h_spacing = params['h_spacing']
+        v_spacing = params['v_spacing']
+        single_width = params['single_width']
+        single_height = params['single_height']
+        images = params['images']
+        
+        # 1. 读取所有图片的原始尺寸（每张图片只读取一次），并按组名分组
+        grouped_images = {}
+        orig_widths = np.zeros(len(images), np.int64)
+        orig_heights = np.zeros(len(images), np.int64)
+        for i, img_data in enumerate(images):
+            arr = self._get_sprite_array(img_data['file_path'])[0]
+            orig_height, orig_width = arr.shape[:2]
+            orig_widths[i] = orig_width
+            orig_heights[i] = orig_height
             
-            # 如果用户指定了单个图片大小，使用指定大小作为单元格大小
+            # 将图片添加到对应组
+            group_name = img_data['group']
+            if group_name not in grouped_images:
+                grouped_images[group_name] = []
+            grouped_images[group_name].append((img_data, orig_width, orig_height))
+        
+        # 2. 确定单元格的基准尺寸（不包含间距）
+        if single_width > 0 and single_height > 0:
+            # 用户指定了单个图片大小，使用指定大小作为单元格大小
+            base_cell_width = single_width
+            base_cell_height = single_height
+        else:
+            # 否则，使用所有图片的最大原始尺寸作为单元格大小
+            base_cell_width = int(orig_widths.max(initial=0))
+            base_cell_height = int(orig_heights.max(initial=0))
+        cell_width = base_cell_width + h_spacing
+        cell_height = base_cell_height + v_spacing
+        
+        # 3. 确定参与拼接的图片及其在网格中的行列位置
+        placed_images = []
+        placed_rows = []
+        placed_cols = []
+        
+        # 检查是否紧凑排列、是否按组拼接
+        tight_pack = params['tight_pack']
+        stitch_by_group = params['stitch_by_group']
+        
+        if tight_pack:
+            # 紧凑排列：所有图片都参与拼接，位置由装箱算法决定
+            placed_images = [image for images in grouped_images.values() for image in images]
+        elif stitch_by_group:
+            # 按组拼接：每个组占据一行，同一组的图片在同一行
+            for row, images in enumerate(grouped_images.values()):
+                for col, image in enumerate(images[:cols]):
+                    placed_images.append(image)
+                    placed_rows.append(row)
+                    placed_cols.append(col)
+        else:
+            # 不按组拼接：按照指定的列数和行数依次摆放所有图片
+            all_images = [image for images in grouped_images.values() for image in images]
+            for i, image in enumerate(all_images[:cols * rows]):
+                placed_images.append(image)
+                placed_rows.append(i // cols)
+                placed_cols.append(i % cols)
+        
+        # 4. 整列计算所有图片在拼接图中的实际位置，找到整个拼接图的最小和最大坐标
+        if tight_pack:
+            # 紧凑排列：每张图片占据自身大小的矩形（指定了单个图片大小时为该大小），不使用偏移量
             if single_width > 0 and single_height > 0:
-                cell_width = single_width + h_spacing
-                cell_height = single_height + v_spacing
+                widths = np.full(len(placed_images), single_width, np.int64)
+                heights = np.full(len(placed_images), single_height, np.int64)
             else:
-                # 否则，计算所有图片的最大原始尺寸作为单元格大小
-                max_width = 0
-                max_height = 0
-                for img_data in self.images_data:
-                    with Image.open(img_data['file_path']) as img:
-                        orig_width, orig_height = img.size
-                        max_width = max(max_width, orig_width)
-                        max_height = max(max_height, orig_height)
-                
-                cell_width = max_width + h_spacing
-                cell_height = max_height + v_spacing
+                widths = np.array([width for _, width, _ in placed_images], np.int64)
+                heights = np.array([height for _, _, height in placed_images], np.int64)
+            lefts, tops = self._pack_ffdh(widths + h_spacing, heights + v_spacing)
+            min_x = 0
+            min_y = 0
+            max_x = int((lefts + widths).max())
+            max_y = int((tops + heights).max())
+        else:
+            placed_data = [img_data for img_data, _, _ in placed_images]
+            offsets_x = self._column('offset_x', placed_data)
+            offsets_y = self._column('offset_y', placed_data)
             
-            # 收集所有图片数据，并按组名分组
-            grouped_images = {}
-            for img_data in self.images_data:
-                with Image.open(img_data['file_path']) as img:
-                    orig_width, orig_height = img.size
-                    # 从列表项文本中获取组名
-                    list_item_text = self.image_list.item(self.images_data.index(img_data)).text()
-                    group_name = "默认组"
-                    # 检查是否包含组名前缀
-                    if list_item_text.startswith('['):
-                        group_end = list_item_text.find(']')
-                        if group_end > 0:
-                            group_name = list_item_text[1:group_end]
-                    
-                    # 将图片添加到对应组
-                    if group_name not in grouped_images:
-                        grouped_images[group_name] = []
-                    grouped_images[group_name].append((img_data, orig_width, orig_height))
+            # 图片中心点 = 单元格中心位置 + 偏移量（考虑用户调整）
+            centers_x = np.array(placed_cols, np.int64) * cell_width + base_cell_width // 2 + offsets_x
+            centers_y = np.array(placed_rows, np.int64) * cell_height + base_cell_height // 2 + offsets_y
+            if not stitch_by_group:
+                # 不按组拼接时，图片坐标在中心点的基础上再加一次偏移量
+                centers_x += offsets_x
+                centers_y += offsets_y
             
-            # 确定单元格的基准尺寸（不包含间距）
+            # 如果用户指定了单个图片大小，使用指定大小，否则使用原始图片大小
             if single_width > 0 and single_height > 0:
-                base_cell_width = single_width
-                base_cell_height = single_height
-            else:
-                base_cell_width = max_width
-                base_cell_height = max_height
-            
-            # 3. 计算所有图片在拼接图中的实际位置和尺寸
-            # 我们需要找到整个拼接图的最小和最大坐标，以确定最终尺寸
-            min_x = float('inf')
-            min_y = float('inf')
-            max_x = 0
-            max_y = 0
-            
-            # 收集所有图片的位置信息
-            image_positions = []
-            
-            # 检查是否按组拼接
-            stitch_by_group = self.stitch_by_group_check.isChecked()
-            
-            if stitch_by_group:
-                # 按组拼接：每个组占据一行
-                current_row = 0
-                
-                # 遍历每个组
-                for group_name, images in grouped_images.items():
-                    # 为每个组创建一行
-                    for i, (img_data, orig_width, orig_height) in enumerate(images):
-                        if i >= cols:
-                            break
-                        
-                        # 计算当前图片在网格中的行列位置
-                        # 同一组的图片在同一行
-                        row = current_row
-                        col = i % cols
-                        
-                        # 计算单元格左上角坐标（不考虑偏移）
-                        cell_x = col * cell_width
-                        cell_y = row * cell_height
-                        
-                        # 计算图片在单元格中的偏移量（考虑用户调整）
-                        offset_x = img_data['offset_x']
-                        offset_y = img_data['offset_y']
-                        
-                        # 计算单元格中心位置
-                        cell_center_x = cell_x + base_cell_width // 2
-                        cell_center_y = cell_y + base_cell_height // 2
-                        
-                        # 计算图片中心点在单元格中的位置（考虑偏移量）
-                        center_x = cell_center_x + offset_x
-                        center_y = cell_center_y + offset_y
-                        
-                        # 计算图片左上角和右下角坐标
-                        # 如果用户指定了单个图片大小，使用指定大小，否则使用原始图片大小
-                        if single_width > 0 and single_height > 0:
-                            # 使用用户指定的大小计算坐标
-                            img_left = center_x - single_width // 2
-                            img_top = center_y - single_height // 2
-                            img_right = center_x + single_width // 2
-                            img_bottom = center_y + single_height // 2
-                        else:
-                            # 使用原始图片大小计算坐标
-                            img_left = center_x - orig_width // 2
-                            img_top = center_y - orig_height // 2
-                            img_right = center_x + orig_width // 2
-                            img_bottom = center_y + orig_height // 2
-                        
-                        # 更新全局坐标范围
-                        min_x = min(min_x, img_left)
-                        min_y = min(min_y, img_top)
-                        max_x = max(max_x, img_right)
-                        max_y = max(max_y, img_bottom)
-                        
-                        # 保存图片位置信息
-                        image_positions.append({
-                            'img_data': img_data,
-                            'orig_width': orig_width,
-                            'orig_height': orig_height,
-                            'left': img_left,
-                            'top': img_top,
-                            'center_x': center_x,
-                            'center_y': center_y
-                        })
-                    
-                    # 下一组换行
-                    current_row += 1
+                half_widths = single_width // 2
+                half_heights = single_height // 2
             else:
-                # 不按组拼接：按照指定的列数和行数依次摆放所有图片
-                all_images = []
-                for group_name, images in grouped_images.items():
-                    for img_data, orig_width, orig_height in images:
-                        all_images.append((img_data, orig_width, orig_height))
-                
-                # 按照指定的行数和列数依次摆放
-                total_images = len(all_images)
-                max_images = cols * rows
-                
-                for i in range(min(total_images, max_images)):
-                    img_data, orig_width, orig_height = all_images[i]
-                    
-                    # 计算当前图片在网格中的行列位置
-                    row = i // cols
-                    col = i % cols
-                    
-                    # 计算单元格左上角坐标（不考虑偏移）
-                    cell_x = col * cell_width
-                    cell_y = row * cell_height
-                    
-                    # 计算图片在单元格中的偏移量（考虑用户调整）
-                    offset_x = img_data['offset_x']
-                    offset_y = img_data['offset_y']
-                    
-                    # 计算单元格中心位置
-                    cell_center_x = cell_x + base_cell_width // 2
-                    cell_center_y = cell_y + base_cell_height // 2
-                    
-                    # 计算图片中心点在单元格中的位置（考虑偏移量）
-                    center_x = cell_center_x + offset_x
-                    center_y = cell_center_y + offset_y
-                    
-                    # 计算图片左上角和右下角坐标
-                    # 使用与工作区显示相同的逻辑：中心点对齐 + 偏移量
-                    # 如果用户指定了单个图片大小，使用指定大小，否则使用原始图片大小
-                    if single_width > 0 and single_height > 0:
-                        # 使用用户指定的大小计算坐标
-                        img_left = center_x - single_width // 2 + offset_x
-                        img_top = center_y - single_height // 2 + offset_y
-                        img_right = center_x + single_width // 2 + offset_x
-                        img_bottom = center_y + single_height // 2 + offset_y
-                    else:
-                        # 使用原始图片大小计算坐标
-                        img_left = center_x - orig_width // 2 + offset_x
-                        img_top = center_y - orig_height // 2 + offset_y
-                        img_right = center_x + orig_width // 2 + offset_x
-                        img_bottom = center_y + orig_height // 2 + offset_y
-                    
-                    # 更新全局坐标范围
-                    min_x = min(min_x, img_left)
-                    min_y = min(min_y, img_top)
-                    max_x = max(max_x, img_right)
-                    max_y = max(max_y, img_bottom)
-                    
-                    # 保存图片位置信息
-                    image_positions.append({
-                        'img_data': img_data,
-                        'orig_width': orig_width,
-                        'orig_height': orig_height,
-                        'left': img_left,
-                        'top': img_top,
-                        'center_x': center_x,
-                        'center_y': center_y
-                    })
+                half_widths = np.array([width for _, width, _ in placed_images], np.int64) // 2
+                half_heights = np.array([height for _, _, height in placed_images], np.int64) // 2
+            lefts = centers_x - half_widths
+            tops = centers_y - half_heights
+            min_x = int(lefts.min())
+            min_y = int(tops.min())
+            max_x = max(int((centers_x + half_widths).max()), 0)
+            max_y = max(int((centers_y + half_heights).max()), 0)
+        
+        # 收集所有图片的位置信息
+        image_positions = [
+            {'img_data': img_data, 'orig_width': orig_width, 'orig_height': orig_height, 'left': left, 'top': top}
+            for (img_data, orig_width, orig_height), left, top in zip(placed_images, lefts.tolist(), tops.tolist())
+        ]
+        
+        # 计算最终拼接图的尺寸
+        total_width = max(max_x - min_x, 0)
+        total_height = max(max_y - min_y, 0)
+        offset_adjust_x = -min_x
+        offset_adjust_y = -min_y
+        
+        # 5. 创建新的空白画布（numpy数组，最后一次性转换为图片）
+        canvas = np.zeros((total_height, total_width, 4), np.uint8)
+        
+        # 6. 粘贴所有图片到正确位置
+        for index, pos in enumerate(image_positions):
+            img_data = pos['img_data']
+            orig_width = pos['orig_width']
+            orig_height = pos['orig_height']
             
-            # 4. 计算最终拼接图的尺寸
-            # 使用自动计算的尺寸，基于单个图片大小和行列数
-            total_width = max(int(max_x - min_x), 0)
-            total_height = max(int(max_y - min_y), 0)
-            offset_adjust_x = -min_x
-            offset_adjust_y = -min_y
+            # 计算调整后的粘贴位置
+            paste_x = int(pos['left'] + offset_adjust_x)
+            paste_y = int(pos['top'] + offset_adjust_y)
             
-            # 5. 创建新的空白图片
-            stitch_img = Image.new('RGBA', (total_width, total_height), (0, 0, 0, 0))
+            # 获取图片数据（已解码的直接复用）
+            arr, alpha_mode, self_mask = self._get_sprite_array(img_data['file_path'])
             
-            # 6. 粘贴所有图片到正确位置
-            for pos in image_positions:
-                img_data = pos['img_data']
-                orig_width = pos['orig_width']
-                orig_height = pos['orig_height']
-                
-                # 计算调整后的粘贴位置
-                paste_x = int(pos['left'] + offset_adjust_x)
-                paste_y = int(pos['top'] + offset_adjust_y)
+            # 如果用户指定了单个图片大小，将图片调整到指定大小，填充透明背景
+            if single_width > 0 and single_height > 0:
+                # 计算原始图片在指定大小的透明背景中的居中位置
+                paste_center_x = (single_width - orig_width) // 2
+                paste_center_y = (single_height - orig_height) // 2
                 
-                # 打开图片
-                with Image.open(img_data['file_path']) as img:
-                    # 如果用户指定了单个图片大小，将图片调整到指定大小，填充透明背景
-                    if single_width > 0 and single_height > 0:
-                        # 创建指定大小的透明背景图片
-                        resized_img = Image.new('RGBA', (single_width, single_height), (0, 0, 0, 0))
-                        
-                        # 计算原始图片在透明背景中的居中位置
-                        paste_center_x = (single_width - orig_width) // 2
-                        paste_center_y = (single_height - orig_height) // 2
+                # 透明背景中只有图片覆盖的部分会影响画布，只为这部分创建透明背景
+                cell_x0, cell_y0 = max(paste_center_x, 0), max(paste_center_y, 0)
+                cell_x1 = min(paste_center_x + orig_width, single_width)
+                cell_y1 = min(paste_center_y + orig_height, single_height)
+                if cell_x0 < cell_x1 and cell_y0 < cell_y1:
+                    if alpha_mode == 'blend' and self_mask:
+                        cell = np.zeros((cell_y1 - cell_y0, cell_x1 - cell_x0, 4), np.uint8)
                         
-                        # 将原始图片居中粘贴到透明背景上
-                        resized_img.paste(img, (paste_center_x, paste_center_y), img if img.mode == 'RGBA' else None)
-                        
-                        # 使用调整后的图片进行粘贴
-                        stitch_img.paste(resized_img, (paste_x, paste_y), resized_img)
+                        # 将原始图片居中粘贴到透明背景上，再粘贴到画布
+                        self._paste_rgba(cell, arr, paste_center_x - cell_x0, paste_center_y - cell_y0, alpha_mode)
+                        self._paste_rgba(canvas, cell, paste_x + cell_x0, paste_y + cell_y0, 'blend')
                     else:
-                        # 否则，直接使用原始图片进行粘贴
-                        stitch_img.paste(img, (paste_x, paste_y), img if img.mode == 'RGBA' else None)
-            
-            return stitch_img
+                        # 没有半透明像素，或图片不以自身为蒙版（原样复制到透明背景上）时，
+                        # 透明背景上的结果就是图片本身被裁剪的部分，按其alpha类型直接粘贴到画布
+                        crop = arr[cell_y0 - paste_center_y:cell_y1 - paste_center_y,
+                                   cell_x0 - paste_center_x:cell_x1 - paste_center_x]
+                        self._paste_rgba(canvas, crop, paste_x + cell_x0, paste_y + cell_y0, alpha_mode)
+            else:
+                # 否则，直接使用原始图片进行粘贴（不以自身为蒙版的图片连同透明像素直接覆盖）
+                self._paste_rgba(canvas, arr, paste_x, paste_y, alpha_mode if self_mask else 'opaque')
             
-        except Exception as e:
-            QMessageBox.critical(self, self.language_dict[self.current_language]['error'], 
-                               self.language_dict[self.current_language]['stitch_failed'].format(str(e)))
-            return None
+            if report_progress is not None:
+                report_progress((index + 1) * 100 // len(image_positions))
+        
+        return canvas
+    
+    def _pack_ffdh(self, widths, heights):
+        """首次适应递减高度（FFDH）装箱：按高度从高到低，依次放入第一个宽度放得下的层
+        
+        Args:
+            widths (numpy.ndarray): 各矩形宽度
+            heights (numpy.ndarray): 各矩形高度
+        
+        Returns:
+            tuple: (左边坐标数组, 顶边坐标数组)
+        """
+        # 层宽度：不小于最宽的矩形，并让拼接结果尽量接近正方形
+        max_width = max(int(widths.max()), int(np.ceil(np.sqrt(float((widths * heights).sum())))))
+        
+        lefts = np.zeros(len(widths), np.int64)
+        tops = np.zeros(len(widths), np.int64)
+        levels = []  # 每层为[顶边y, 层高, 已用宽度]，层高为该层第一个（最高的）矩形的高度
+        for i in np.argsort(-heights, kind='stable').tolist():
+            width = int(widths[i])
+            for level in levels:
+                if level[2] + width <= max_width:
+                    break
+            else:
+                # 已有的层都放不下，在最下方新开一层
+                level = [levels[-1][0] + levels[-1][1] if levels else 0, int(heights[i]), 0]
+                levels.append(level)
+            lefts[i] = level[2]
+            tops[i] = level[0]
+            level[2] += width
+        return lefts, tops
     
     def stitch_and_save_sprites(self):
-        """拼接并保存精灵图"""
-        # 拼接精灵图
-        stitch_img = self.stitch_sprites()
+        """拼接并保存精灵图（拼接在后台线程中进行）"""
+        if not self.images_data:
+            QMessageBox.warning(self, self.language_dict[self.current_language]['warning'], 
+                               self.language_dict[self.current_language]['please_import_images'])
+            return
+        
+        # 上一次拼接尚未完成
+        if self.stitch_thread is not None:
+            return
+        
+        # 在主线程中收集参数快照，后台线程不访问界面控件
+        params = self._collect_stitch_params()
         
-        if stitch_img:
+        self.stitch_save_btn.setEnabled(False)
+        self.stitch_progress_bar.setValue(0)
+        self.stitch_progress_bar.setVisible(True)
+        
+        # 创建拼接工作对象
+        worker = StitchWorker(self._compose_sprite_sheet, params)
+        worker.progress_updated.connect(self.stitch_progress_bar.setValue)
+        worker.stitch_finished.connect(self.on_stitch_finished)
+        worker.stitch_failed.connect(self.on_stitch_failed)
+        self._start_stitch_thread(worker)
+    
+    def _start_stitch_thread(self, worker):
+        """在新线程中执行拼接或保存工作，避免阻塞UI"""
+        self.stitch_worker = worker
+        self.stitch_thread = QThread()
+        self.stitch_worker.moveToThread(self.stitch_thread)
+        self.stitch_thread.started.connect(self.stitch_worker.run)
+        self.stitch_thread.start()
+    
+    def _finish_stitch_thread(self):
+        """结束后台拼接线程并恢复界面状态"""
+        self.stitch_thread.quit()
+        self.stitch_thread.wait()
+        self.stitch_thread = None
+        self.stitch_worker = None
+        self.stitch_progress_bar.setVisible(False)
+        self.stitch_progress_bar.setRange(0, 100)
+        self.stitch_save_btn.setEnabled(bool(self.images_data))
+    
+    def on_stitch_finished(self, canvas):
+        """拼接完成处理：预览并保存拼接结果"""
+        self._finish_stitch_thread()
+        
+        if canvas is not None:
             try:
                 # 显示拼接结果预览
-                self.show_stitch_preview(stitch_img)
+                self.show_stitch_preview(canvas)
                 
                 # 打开文件保存对话框
                 file_path, _ = QFileDialog.getSaveFileName(
@@ -2385,14 +2906,37 @@ class SpriteAlignerGUI(QMainWindow):
                 if file_path:
                     # 更新最后选择的路径
                     self.update_last_selected_path(file_path)
-                    # 保存拼接结果
-                    stitch_img.save(file_path, 'PNG')
-                    QMessageBox.information(self, self.language_dict[self.current_language]['success'], 
-                                           self.language_dict[self.current_language]['stitch_result_saved'].format(file_path))
+                    
+                    # 在后台线程中保存拼接结果，保存期间进度条显示为忙碌状态
+                    self.stitch_save_btn.setEnabled(False)
+                    self.stitch_progress_bar.setRange(0, 0)
+                    self.stitch_progress_bar.setVisible(True)
+                    worker = SaveWorker(canvas, file_path)
+                    worker.save_finished.connect(self.on_save_finished)
+                    worker.save_failed.connect(self.on_save_failed)
+                    self._start_stitch_thread(worker)
             except Exception as e:
                 QMessageBox.critical(self, self.language_dict[self.current_language]['error'], 
                                    self.language_dict[self.current_language]['save_failed'].format(str(e)))
     
+    def on_stitch_failed(self, message):
+        """拼接失败处理"""
+        self._finish_stitch_thread()
+        QMessageBox.critical(self, self.language_dict[self.current_language]['error'], 
+                           self.language_dict[self.current_language]['stitch_failed'].format(message))
+    
+    def on_save_finished(self, file_path):
+        """保存完成处理"""
+        self._finish_stitch_thread()
+        QMessageBox.information(self, self.language_dict[self.current_language]['success'], 
+                               self.language_dict[self.current_language]['stitch_result_saved'].format(file_path))
+    
+    def on_save_failed(self, message):
+        """保存失败处理"""
+        self._finish_stitch_thread()
+        QMessageBox.critical(self, self.language_dict[self.current_language]['error'], 
+                           self.language_dict[self.current_language]['save_failed'].format(message))
+    
     def export_offset_settings(self):
         """导出图片偏移设置到文件"""
         if not self.images_data:
@@ -2406,7 +2950,7 @@ class SpriteAlignerGUI(QMainWindow):
             for img_data in self.images_data:
                 offset_info = {
                     'file_path': img_data['file_path'],
-                    'filename': os.path.basename(img_data['file_path']),
+                    'filename': img_data['basename'],
                     'offset_x': img_data['offset_x'],
                     'offset_y': img_data['offset_y']
                 }
@@ -2450,23 +2994,26 @@ class SpriteAlignerGUI(QMainWindow):
                 with open(file_path, 'r', encoding='utf-8') as f:
                     offset_data = json.load(f)
                 
+                # 按文件名建立索引（同名图片取列表中的第一张），避免逐条偏移数据遍历整个图片列表
+                images_by_name = {}
+                for img_data in self.images_data:
+                    images_by_name.setdefault(img_data['basename'], img_data)
+                
                 # 应用偏移数据到图片
                 applied_count = 0
                 for offset_info in offset_data:
                     # 查找对应的图片
-                    for img_data in self.images_data:
-                        if os.path.basename(img_data['file_path']) == offset_info['filename']:
-                            # 应用偏移量
-                            img_data['offset_x'] = offset_info['offset_x']
-                            img_data['offset_y'] = offset_info['offset_y']
-                            applied_count += 1
-                            break
+                    img_data = images_by_name.get(offset_info['filename'])
+                    if img_data is not None:
+                        # 应用偏移量
+                        img_data['offset_x'] = offset_info['offset_x']
+                        img_data['offset_y'] = offset_info['offset_y']
+                        applied_count += 1
                 
                 # 更新当前选中图片的偏移控件值
                 if 0 <= self.selected_index < len(self.images_data):
                     current_img = self.images_data[self.selected_index]
-                    self.x_spin.setValue(current_img['offset_x'])
-                    self.y_spin.setValue(current_img['offset_y'])
+                    self._sync_offset_spins(current_img)
                 
                 # 更新工作区显示
                 self.update_workspace()
@@ -2478,21 +3025,28 @@ class SpriteAlignerGUI(QMainWindow):
                                self.language_dict[self.current_language]['import_failed'].format(str(e)))
     
     def toggle_stitch_mode(self):
-        """切换拼接模式：按组拼接时禁用行列数设置，否则启用"""
-        stitch_by_group = self.stitch_by_group_check.isChecked()
+        """切换拼接模式：按组拼接或紧凑排列时禁用行列数设置，否则启用"""
+        tight_pack = self.tight_pack_check.isChecked()
+        use_grid = not self.stitch_by_group_check.isChecked() and not tight_pack
+        
+        # 紧凑排列不分组，禁用按组拼接选项
+        self.stitch_by_group_check.setEnabled(not tight_pack)
         
         # 启用或禁用行列数设置控件
-        self.columns_label.setEnabled(not stitch_by_group)
-        self.cols_spin.setEnabled(not stitch_by_group)
-        self.rows_label.setEnabled(not stitch_by_group)
-        self.rows_spin.setEnabled(not stitch_by_group)
-    
-    def show_stitch_preview(self, stitch_img):
-        """显示拼接结果预览"""
-        # 将PIL Image转换为QPixmap
-        img = stitch_img.convert('RGBA')
-        data = img.tobytes("raw", "RGBA")
-        qimage = QImage(data, img.width, img.height, QImage.Format_RGBA8888)
+        self.columns_label.setEnabled(use_grid)
+        self.cols_spin.setEnabled(use_grid)
+        self.rows_label.setEnabled(use_grid)
+        self.rows_spin.setEnabled(use_grid)
+    
+    def show_stitch_preview(self, canvas):
+        """显示拼接结果预览
+        
+        Args:
+            canvas (numpy.ndarray): 拼接结果的RGBA画布，形状为(高, 宽, 4)
+        """
+        # 直接用画布内存构造QImage，不再经PIL复制一份RGBA数据；缩放交给预览控件在绘制时完成
+        height, width = canvas.shape[:2]
+        qimage = QImage(canvas.data, width, height, canvas.strides[0], QImage.Format_RGBA8888)
         pixmap = QPixmap.fromImage(qimage)
         
         # 创建预览窗口
@@ -2501,16 +3055,9 @@ class SpriteAlignerGUI(QMainWindow):
         preview_window.resize(800, 600)
         
         layout = QVBoxLayout(preview_window)
-        label = QLabel()
-        label.setPixmap(pixmap.scaled(800, 600, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        label.setAlignment(Qt.AlignCenter)
-        
-        scroll_area = QScrollArea()
-        scroll_area.setWidget(label)
-        scroll_area.setWidgetResizable(True)
-        
-        layout.addWidget(scroll_area)
+        layout.addWidget(StitchPreviewWidget(pixmap))
         preview_window.show()
+        self.preview_window = preview_window
 
 
 if __name__ == "__main__":